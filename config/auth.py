@@ -2,80 +2,246 @@ from google.cloud import firestore, storage
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 import vertexai
 from vertexai.generative_models import GenerativeModel
 from config.settings import DB_SERVICE_ACCOUNT_PATH, GENAI_SERVICE_ACCOUNT_PATH, CLIENT_TOKEN_PATH, GOOGLE_CLOUD_PROJECT, GEMINI_MODEL, GEMINI_MODEL_LOCATION
-import os, pickle
+import copy, os, pickle, threading, time, logging
 
-def get_firestore_cloud_client():
+class ClientRegistry:
     """
-    Returns a Firestore client authenticated with the service account.
+    Process-wide registry of lazily constructed API clients.
+
+    Each client is built once per process, on first use, by the factory registered under its
+    name, and the same instance is shared by every manager afterwards. The registry records how
+    long each construction took so the cold-start cost of every client can be inspected.
+
+    Attributes:
+        build_timings (dict): Maps client names to the seconds spent building them.
+        build_counts (dict): Maps client names to the number of times they were built.
     """
+
+    def __init__(self):
+        """
+        Initializes an empty registry.
+        """
+        self._factories = {}
+        self._clients = {}
+        self._lock = threading.RLock()
+        self.build_timings = {}
+        self.build_counts = {}
+
+    def register(self, name, factory):
+        """
+        Registers a zero-argument factory that builds the client stored under the given name.
+
+        Args:
+            name (str): The name of the client.
+            factory (callable): A callable returning a fully constructed client.
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._clients.pop(name, None)
+
+    def get(self, name):
+        """
+        Returns the client stored under the given name, building it on first use.
+
+        Args:
+            name (str): The name of the client.
+
+        Returns:
+            Any: The shared client instance.
+
+        Raises:
+            KeyError: If no factory is registered under the given name.
+        """
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+        with self._lock:
+            # Another thread may have built the client while we were waiting for the lock
+            if name not in self._clients:
+                start = time.perf_counter()
+                self._clients[name] = self._factories[name]()
+                elapsed = time.perf_counter() - start
+                self.build_timings[name] = self.build_timings.get(name, 0.0) + elapsed
+                self.build_counts[name] = self.build_counts.get(name, 0) + 1
+                logging.info(f"Client '{name}' built in {elapsed * 1000:.1f} ms.")
+            return self._clients[name]
+
+    def replace(self, name, client, *dependents):
+        """
+        Stores a new instance of a client, e.g. refreshed credentials, and drops the clients built
+        from the previous one so that they are rebuilt on next use.
+
+        Args:
+            name (str): The name of the client.
+            client (Any): The new client instance.
+            *dependents (str): The clients built from the replaced one.
+        """
+        with self._lock:
+            self._clients[name] = client
+            for dependent in dependents:
+                self._clients.pop(dependent, None)
+
+    def reset(self, *names):
+        """
+        Drops cached clients so that they are rebuilt on next use.
+
+        Args:
+            *names (str): The clients to drop. Drops every client when no name is given.
+        """
+        with self._lock:
+            for name in names or list(self._clients):
+                self._clients.pop(name, None)
+
+    def stats(self):
+        """
+        Returns the construction counters of every client built so far.
+
+        Returns:
+            dict: Maps client names to a dictionary with 'builds' and 'total_ms' entries.
+        """
+        with self._lock:
+            return {
+                name: {"builds": self.build_counts[name], "total_ms": self.build_timings[name] * 1000}
+                for name in self.build_counts
+            }
+
+def _build_firestore_cloud_client():
     # Firestore client
-    firestore_client = firestore.Client.from_service_account_json(
+    return firestore.Client.from_service_account_json(
         DB_SERVICE_ACCOUNT_PATH,
         project=GOOGLE_CLOUD_PROJECT
     )
-    return firestore_client
 
-def get_cloud_storage_client():
-    """
-    Returns a Cloud Storage client authenticated with the service account.
-    """
+def _build_cloud_storage_client():
     # Google Cloud Storage client
-    storage_client = storage.Client.from_service_account_json(
+    return storage.Client.from_service_account_json(
         DB_SERVICE_ACCOUNT_PATH,
         project=GOOGLE_CLOUD_PROJECT
     )
-    return storage_client
 
-def get_gemini_model():
-    """
-    Configures and returns a Gemini Generative AI model client authenticated with a service account.
-    """
+def _build_gemini_model():
     # Only initialize the Vertex AI client with service account credentials
     credentials = service_account.Credentials.from_service_account_file(GENAI_SERVICE_ACCOUNT_PATH)
     vertexai.init(project=GOOGLE_CLOUD_PROJECT, location=GEMINI_MODEL_LOCATION, credentials=credentials)
     # Initialize and return the Generative Model client
-    model = GenerativeModel(GEMINI_MODEL)
-    return model
+    return GenerativeModel(GEMINI_MODEL)
 
-def get_oauth_client_token():
-    """
-    Authenticates and returns valid credentials for accessing Google APIs, 
-    using a .pickle token file to store and refresh the credentials as needed.
-    """
+def _load_oauth_client_token():
     creds = None
     # Load existing credentials from the pickle file
     if os.path.exists(CLIENT_TOKEN_PATH):
         with open(CLIENT_TOKEN_PATH, 'rb') as token_file:
             creds = pickle.load(token_file)
-    # If no valid credentials are available, raise an error or exit
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            # Refresh the credentials if expired
-            creds.refresh(Request())
-            # Save the refreshed credentials back to the pickle file
-            with open(CLIENT_TOKEN_PATH, 'wb') as token_file:
-                pickle.dump(creds, token_file)
-        else:
+    if not creds:
+        raise RuntimeError(
+            "Token file is missing or invalid. Please ensure the token file is present at: "
+            f"{CLIENT_TOKEN_PATH}"
+        )
+    return creds
+
+# The services are built under the registry lock, so they take the credentials as they are instead of
+# refreshing them, which swaps clients in the registry. Their transport refreshes expired credentials.
+def _build_google_drive_service():
+    return build('drive', 'v3', credentials=client_registry.get("oauth_token"))
+
+def _build_google_docs_service():
+    return build('docs', 'v1', credentials=client_registry.get("oauth_token"))
+
+client_registry = ClientRegistry()
+client_registry.register("firestore", _build_firestore_cloud_client)
+client_registry.register("storage", _build_cloud_storage_client)
+client_registry.register("gemini", _build_gemini_model)
+client_registry.register("oauth_token", _load_oauth_client_token)
+client_registry.register("drive", _build_google_drive_service)
+client_registry.register("docs", _build_google_docs_service)
+# Serializes token refreshes, so that concurrent callers refresh the credentials only once
+_refresh_lock = threading.Lock()
+
+def get_firestore_cloud_client():
+    """
+    Returns the shared Firestore client authenticated with the service account.
+    """
+    return client_registry.get("firestore")
+
+def get_cloud_storage_client():
+    """
+    Returns the shared Cloud Storage client authenticated with the service account.
+    """
+    return client_registry.get("storage")
+
+def get_gemini_model():
+    """
+    Returns the shared Gemini Generative AI model client authenticated with a service account.
+    Vertex AI is initialized only once per process, when the model is first requested.
+    """
+    return client_registry.get("gemini")
+
+def refresh_credentials(force=False):
+    """
+    Refreshes the shared OAuth credentials when they are no longer valid, and saves the refreshed
+    token back to the pickle file. A copy of the credentials is refreshed without holding the
+    registry lock, so other clients stay available during the network call; the registry then
+    swaps in the new credentials and drops the Drive and Docs services, rebuilt on next use.
+
+    Args:
+        force (bool): Refresh even if the credentials are still valid.
+
+    Returns:
+        Credentials: The shared OAuth credentials.
+
+    Raises:
+        RuntimeError: If the credentials are invalid and cannot be refreshed.
+    """
+    creds = client_registry.get("oauth_token")
+    if force or not creds.valid:
+        if not creds.refresh_token:
             raise RuntimeError(
                 "Token file is missing or invalid. Please ensure the token file is present at: "
                 f"{CLIENT_TOKEN_PATH}"
             )
+        with _refresh_lock:
+            # Another caller may have refreshed the credentials while we were waiting for the lock
+            creds = client_registry.get("oauth_token")
+            if force or not creds.valid:
+                # Refresh a copy, so that requests in flight keep using the previous token
+                creds = copy.copy(creds)
+                creds.refresh(Request())
+                # Save the refreshed credentials back to the pickle file
+                with open(CLIENT_TOKEN_PATH, 'wb') as token_file:
+                    pickle.dump(creds, token_file)
+                client_registry.replace("oauth_token", creds, "drive", "docs")
     return creds
 
+def get_oauth_client_token():
+    """
+    Returns valid shared credentials for accessing Google APIs, loading them from the .pickle
+    token file on first use and refreshing them as needed.
+    """
+    return refresh_credentials()
+
+def get_authorized_http():
+    """
+    Builds a new authorized HTTP transport using the shared OAuth credentials. httplib2 transports
+    are not thread-safe, so every thread issuing Google API requests concurrently needs its own.
+    """
+    return AuthorizedHttp(get_oauth_client_token(), http=httplib2.Http())
+
 def get_google_drive_service():
     """
-    Builds and returns an authenticated Google Drive API service.
+    Returns the shared authenticated Google Drive API service.
     """
-    return build('drive', 'v3', credentials=get_oauth_client_token())
+    return client_registry.get("drive")
 
 def get_google_docs_service():
     """
-    Builds and returns an authenticated Google Docs API service.
+    Returns the shared authenticated Google Docs API service.
     """
-    return build('docs', 'v1', credentials=get_oauth_client_token())
+    return client_registry.get("docs")
 
 # if __name__ == "__main__":
 #     # Test the function
@@ -88,4 +254,5 @@ def get_google_docs_service():
 #     drive_service = get_google_drive_service()
 #     print(drive_service)
 #     docs_service = get_google_docs_service()
-#     print(docs_service)
\ No newline at end of file
+#     print(docs_service)
+#     print(client_registry.stats())
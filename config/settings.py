@@ -11,4 +11,55 @@ GOOGLE_CLOUD_PROJECT = "gdg-fisk-content-automation"
 
 # Gemini Configurations
 GEMINI_MODEL = "gemini-1.5-flash-002"
-GEMINI_MODEL_LOCATION = "us-central1"
\ No newline at end of file
+GEMINI_MODEL_LOCATION = "us-central1"
+GEMINI_PROMPT_TOKEN_BUDGET = 100000  # Maximum number of prompt tokens sent in one request
+GEMINI_LONG_DOCUMENT_TOKENS = 16000  # Readmes above this estimated size are extracted in chunks
+GEMINI_CHUNK_TOKENS = 6000  # Maximum estimated size of one readme chunk
+
+# Gemini async request limits, shared by every GeminiProcessor of the process
+GEMINI_MAX_CONCURRENT_REQUESTS = 8
+GEMINI_REQUESTS_PER_MINUTE = 200
+GEMINI_TOKENS_PER_MINUTE = 1000000
+GEMINI_REQUEST_TIMEOUT_SECONDS = 120
+GEMINI_MAX_RETRIES = 5
+
+# Gemini response cache: None, "memory", "disk" or "firestore" (the last two add a persistent tier)
+GEMINI_CACHE_BACKEND = "firestore"
+GEMINI_CACHE_MEMORY_SIZE = 256
+GEMINI_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+GEMINI_CACHE_DIR = os.path.join(BASE_DIR, ".gemini_cache")
+GEMINI_CACHE_COLLECTION = "gemini-response-cache"
+
+# Vertex AI context caching of static prompt prefixes. Prefixes below the minimum cacheable
+# size of the model (32,768 tokens for Gemini 1.5) are sent inline with every request instead.
+GEMINI_CONTEXT_CACHE_ENABLED = True
+GEMINI_CONTEXT_CACHE_MIN_TOKENS = 32768
+GEMINI_CONTEXT_CACHE_TTL_SECONDS = 60 * 60
+
+# Gemini batch prediction jobs used for bulk re-extraction
+GEMINI_BATCH_BUCKET = "gdg-fisk-content-batch"
+GEMINI_BATCH_POLL_SECONDS = 30
+
+# Folder ingestion pipeline concurrency (number of workers per stage)
+DRIVE_EXPORT_CONCURRENCY = 4
+GCS_UPLOAD_CONCURRENCY = 4
+GEMINI_CONCURRENCY = 2
+FIRESTORE_WRITE_CONCURRENCY = 2
+
+# In-process cache of the page documents read from Firestore. Cached documents are served for up to
+# FIRESTORE_CACHE_MAX_STALENESS_SECONDS before their update time is checked again, unless listeners
+# keep them current (one open stream per page document, worth it for long-running processes only)
+FIRESTORE_CACHE_ENABLED = True
+FIRESTORE_CACHE_MAX_STALENESS_SECONDS = 30
+FIRESTORE_CACHE_LISTENERS = False
+
+# Number of images decoded and uploaded at the same time while publishing a document
+GCS_IMAGE_UPLOAD_CONCURRENCY = 8
+# Number of published image URLs remembered per process to skip existence checks
+PUBLISHED_IMAGE_CACHE_SIZE = 1024
+
+# Optional transcoding of published images to downsized WebP (requires Pillow)
+IMAGE_TRANSCODE_ENABLED = False
+IMAGE_MAX_WIDTH = 1600
+IMAGE_MAX_HEIGHT = 1600
+IMAGE_WEBP_QUALITY = 80
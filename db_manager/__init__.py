@@ -1,4 +1,5 @@
 from .firestore_manager import FirestoreManager
 from .gcs_manager import GcsManager
+from .document_cache import DocumentCache
 
-__all__ = ["FirestoreManager", "GcsManager"]
\ No newline at end of file
+__all__ = ["FirestoreManager", "GcsManager", "DocumentCache"]
\ No newline at end of file
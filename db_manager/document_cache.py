@@ -0,0 +1,169 @@
+import copy
+import logging
+import threading
+import time
+
+class DocumentCache:
+    """
+    In-process read-through cache of Firestore documents and single fields.
+
+    Entries are kept coherent in one of two ways:
+
+    - with listeners, `watch` subscribes to a document with `on_snapshot`, and every change
+      pushed by Firestore replaces the cached document, which is then always served from memory;
+    - otherwise, entries older than `max_staleness_seconds` are revalidated: the document is read
+      with a field mask and its cached data is reused when its `update_time` did not change.
+
+    One cache is shared by the managers of a collection in a process, and writes made through any
+    of them invalidate the written documents right away, so a process always reads its own writes.
+
+    Attributes:
+        max_staleness_seconds (float): How long an entry that is not kept by a listener is served
+            without checking Firestore.
+        hits (int): The number of reads served from memory.
+        misses (int): The number of reads that went to Firestore.
+    """
+
+    def __init__(self, max_staleness_seconds):
+        """
+        Initializes the cache.
+
+        Args:
+            max_staleness_seconds (float): How long an entry that is not kept by a listener is served
+                without checking Firestore. Zero revalidates every read.
+        """
+        self.max_staleness_seconds = max_staleness_seconds
+        self.hits = 0
+        self.misses = 0
+        # (doc_name, field_name or None) -> (exists, data, update_time, fetched_at)
+        self._entries = {}
+        self._watches = {}
+        self._synced = set()
+        self._lock = threading.Lock()
+        self._watch_lock = threading.Lock()
+
+    def _lookup(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def _store(self, key, snapshot, data):
+        with self._lock:
+            self._entries[key] = (snapshot.exists, data, snapshot.update_time, time.monotonic())
+
+    def _is_fresh(self, doc_name, entry):
+        return doc_name in self._synced or time.monotonic() - entry[3] <= self.max_staleness_seconds
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get_document(self, doc_name, doc_ref):
+        """
+        Returns a document, from memory when its cached entry is fresh or still current.
+
+        Args:
+            doc_name (str): The name of the document.
+            doc_ref (DocumentReference): The reference of the document.
+
+        Returns:
+            tuple: Whether the document exists, and a copy of its data.
+        """
+        entry = self._lookup((doc_name, None))
+        if entry is not None and not self._is_fresh(doc_name, entry):
+            # Only the update time is needed to tell whether the cached data is still current
+            snapshot = doc_ref.get(field_paths=["lastUpdated"])
+            if snapshot.exists == entry[0] and snapshot.update_time == entry[2]:
+                self._store((doc_name, None), snapshot, entry[1])
+            else:
+                entry = None
+        self._count(entry is not None)
+        if entry is None:
+            snapshot = doc_ref.get()
+            data = snapshot.to_dict() if snapshot.exists else None
+            self._store((doc_name, None), snapshot, data)
+            entry = self._lookup((doc_name, None))
+        return entry[0], copy.deepcopy(entry[1])
+
+    def get_field(self, doc_name, field_name, doc_ref):
+        """
+        Returns one field of a document, from the cached document or field when fresh. Otherwise
+        only the field is downloaded, with a field mask.
+
+        Args:
+            doc_name (str): The name of the document.
+            field_name (str): The name of the field.
+            doc_ref (DocumentReference): The reference of the document.
+
+        Returns:
+            tuple: Whether the document exists, whether it has the field, and a copy of its value.
+        """
+        for key in ((doc_name, None), (doc_name, field_name)):
+            entry = self._lookup(key)
+            if entry is not None and self._is_fresh(doc_name, entry):
+                self._count(True)
+                data = entry[1] or {}
+                return entry[0], field_name in data, copy.deepcopy(data.get(field_name))
+        self._count(False)
+        snapshot = doc_ref.get(field_paths=[field_name])
+        data = snapshot.to_dict() if snapshot.exists else None
+        self._store((doc_name, field_name), snapshot, data)
+        data = data or {}
+        return snapshot.exists, field_name in data, copy.deepcopy(data.get(field_name))
+
+    def invalidate(self, doc_name):
+        """
+        Drops the cached document and fields of a document, e.g. after writing it.
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == doc_name]:
+                del self._entries[key]
+
+    def watch(self, doc_name, doc_ref):
+        """
+        Keeps a document coherent with an `on_snapshot` listener, so that it is served from memory
+        until the listener is closed.
+
+        Args:
+            doc_name (str): The name of the document.
+            doc_ref (DocumentReference): The reference of the document.
+        """
+        def on_snapshot(snapshots, changes, read_time):
+            for snapshot in snapshots:
+                self.invalidate(doc_name)
+                self._store((doc_name, None), snapshot, snapshot.to_dict() if snapshot.exists else None)
+            self._synced.add(doc_name)
+
+        with self._watch_lock:
+            if doc_name in self._watches:
+                return
+            # The first snapshot is delivered asynchronously; until then entries are revalidated as usual
+            self._watches[doc_name] = doc_ref.on_snapshot(on_snapshot)
+        logging.info(f"Listening to changes of document '{doc_name}'.")
+
+    def close(self):
+        """
+        Unsubscribes every listener. Their documents are then revalidated like the other entries.
+        """
+        with self._watch_lock:
+            watches, self._watches = self._watches, {}
+        for doc_name, watch in watches.items():
+            try:
+                watch.unsubscribe()
+            except Exception as e:
+                logging.error(f"Error closing the listener of document '{doc_name}': {e}")
+            self._synced.discard(doc_name)
+            self.invalidate(doc_name)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+            dict: The 'hits', 'misses' and 'hit_ratio' of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / lookups if lookups else 0.0}
@@ -1,8 +1,11 @@
 import logging
+import threading
 from google.cloud import firestore
 from config.auth import get_firestore_cloud_client
-from models import ProjectsPageResponse, CodelabsPageResponse, CulturePageResponse, HomePageResponse, VideoContent
-from dataclasses import asdict
+from config.settings import FIRESTORE_CACHE_ENABLED, FIRESTORE_CACHE_MAX_STALENESS_SECONDS, FIRESTORE_CACHE_LISTENERS
+from .document_cache import DocumentCache
+from models import ModelValidationError, ProjectsPageResponse, CodelabsPageResponse, CulturePageResponse, HomePageResponse, VideoContent, ProjectSummary, Model, Project, Codelab, Testimonial
+from dataclasses import asdict, fields
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -14,18 +17,116 @@ DEFAULT_CULTURE_VIDEO = VideoContent(
     genres=["SARCASM", "COLLABORATIVE LEARNING", "PASSION"]
 )
 HOME_VIDEO_URL = "/"
+BATCH_WRITE_LIMIT = 500  # Maximum number of writes in one Firestore batch
+BULK_WRITE_MAX_ATTEMPTS = 15  # Attempts of a BulkWriter write before it is given up, as by default
+
+# Collections whose page documents are known to exist, bootstrapped at most once per process
+_bootstrapped_collections = set()
+_bootstrap_lock = threading.Lock()
+# Document caches shared by every manager of a process, by collection
+_document_caches = {}
+_document_caches_lock = threading.Lock()
+
+def _shared_document_cache(collection_name: str) -> DocumentCache:
+    """
+    Returns the process-wide document cache of a collection, creating it on first use.
+    """
+    with _document_caches_lock:
+        cache = _document_caches.get(collection_name)
+        if cache is None:
+            cache = _document_caches[collection_name] = DocumentCache(FIRESTORE_CACHE_MAX_STALENESS_SECONDS)
+        return cache
+
+def _find_item(items: list, key: str, key_value: any) -> int | None:
+    """
+    Returns the index of the first item of a list whose key has the given value, or None.
+    """
+    for index, item in enumerate(items):
+        if isinstance(item, dict) and item.get(key) == key_value:
+            return index
+    return None
+
+def _project_summary(project: dict) -> dict:
+    """
+    Builds the home page summary of a project.
+    """
+    return {field.name: project.get(field.name) for field in fields(ProjectSummary)}
+
+def _same_item(item: dict) -> dict:
+    return item
+
+def _upserter(item: dict, key: str):
+    """
+    Returns a list mutation replacing the item with the key of the given item, or appending it.
+    """
+    def upsert(items, convert):
+        index = _find_item(items, key, item[key])
+        new_item = convert(item)
+        if index is None:
+            items.append(new_item)
+        elif items[index] == new_item:
+            return None
+        else:
+            items[index] = new_item
+        return items
+    return upsert
+
+def _remover(key_value: any, key: str):
+    """
+    Returns a list mutation removing the item with the given key.
+    """
+    def remove(items, convert):
+        index = _find_item(items, key, key_value)
+        if index is None:
+            return None
+        del items[index]
+        return items
+    return remove
+
+# Lists derived item by item from another list, kept consistent with it by upserts and removals:
+# (doc_name, field_name) -> [(mirror_doc_name, mirror_field_name, convert)]
+LIST_MIRRORS = {
+    ("ProjectsPageResponse", "projects"): [("HomePageResponse", "projectSummaries", _project_summary)],
+}
+
+# Every entity is stored as its own document, in a subcollection of its page document named after
+# the list field of the page. The list field only holds the materialized summaries of the entities:
+# collection_name -> (doc_name, model, summarize)
+ENTITY_COLLECTIONS = {
+    "projects": ("ProjectsPageResponse", Project, _project_summary),
+    "codelabs": ("CodelabsPageResponse", Codelab, _same_item),
+    "testimonials": ("CulturePageResponse", Testimonial, _same_item),
+}
 
 class FirestoreManager:
     """
     Service class for interacting with the Firestore database,
     providing helpers for CRUD operations and ensuring required documents
     are present in the 'gdg-fisk-content' collection.
+
+    Every mutation is a single round trip: writes use `set` with merge field paths instead of
+    reading the document first, list appends use `ArrayUnion`, and read-modify-write updates of
+    list items run in a transaction so that concurrent writers never lose each other's changes.
+
+    List items are upserted and removed by key. Lists mirrored by other lists, such as the projects
+    summarized on the home page, are kept consistent in the same transaction.
+
+    Projects, codelabs and testimonials are entities: each one is a document of a subcollection of
+    its page document, e.g. 'ProjectsPageResponse/projects/<id>', while the page document only keeps
+    their summaries. Listing pages read the small page documents, single entities are read by id,
+    and writing an entity only rewrites its document and the summary lists.
+
+    Reads of the page documents go through a `DocumentCache` shared by the managers of the
+    collection in the process, revalidated after
+    `FIRESTORE_CACHE_MAX_STALENESS_SECONDS` or kept current by listeners when
+    `FIRESTORE_CACHE_LISTENERS` is set. Writes invalidate the documents they touch.
     """
 
     def __init__(self):
         """
-        Initializes the FirestoreManager class by setting up a Firestore client,
-        the collection name, and ensuring required documents are present.
+        Initializes the FirestoreManager class by setting up a Firestore client and
+        the collection name. No request is sent: the required documents are only
+        bootstrapped before the first write, see `bootstrap_documents`.
         """
         self.client = get_firestore_cloud_client()
         self.collection_name = "gdg-fisk-content"
@@ -35,36 +136,150 @@ class FirestoreManager:
             "CulturePageResponse": CulturePageResponse(culturePageVideo=DEFAULT_CULTURE_VIDEO, testimonials=[], metrics=[]),
             "HomePageResponse": HomePageResponse(homeVideoUrl=HOME_VIDEO_URL, projectSummaries=[], testimonials=[])
         }
-        self._initialize_documents()
+        self.cache = _shared_document_cache(self.collection_name) if FIRESTORE_CACHE_ENABLED else None
+        if self.cache is not None and FIRESTORE_CACHE_LISTENERS:
+            for doc_name in self.documents:
+                self.cache.watch(doc_name, self._document(doc_name))
 
-    def _initialize_documents(self):
+    def bootstrap_documents(self) -> list | None:
         """
         Ensures that all required documents are present in the Firestore collection.
-        If a document does not exist, it is created with default data.
+        Missing documents are created with default data. A single batch read checks every
+        document, and only missing documents are created, in a transaction so that documents
+        created concurrently are never overwritten.
+        Returns:
+            list: The names of the created documents, or None if the bootstrap failed.
         """
-        for doc_name, default_instance in self.documents.items():
-            doc_ref = self.client.collection(self.collection_name).document(doc_name)
+        refs = {doc_name: self._document(doc_name) for doc_name in self.documents}
+        try:
+            # Only the existence of the documents is needed
+            snapshots = self.client.get_all(list(refs.values()), field_paths=["lastUpdated"])
+            missing = set(refs) - {snapshot.id for snapshot in snapshots if snapshot.exists}
+            if not missing:
+                logging.info("All required documents already exist.")
+                return []
+
+            @firestore.transactional
+            def create_missing(transaction):
+                created = []
+                for snapshot in transaction.get_all([refs[doc_name] for doc_name in missing]):
+                    if not snapshot.exists:
+                        transaction.set(snapshot.reference, self._convert_to_dict(self.documents[snapshot.id]))
+                        created.append(snapshot.id)
+                return created
+
             try:
-                if not doc_ref.get().exists:
-                    logging.info(f"Document '{doc_name}' does not exist. Creating...")
-                    doc_ref.set(self._convert_to_dict(default_instance))
-                else:
-                    logging.info(f"Document '{doc_name}' already exists.")
-            except Exception as e:
-                logging.error(f"Error initializing document '{doc_name}': {e}")
+                created = create_missing(self.client.transaction())
+            finally:
+                self._invalidate(*missing)
+            for doc_name in created:
+                logging.info(f"Document '{doc_name}' created with default data.")
+            return created
+        except Exception as e:
+            logging.error(f"Error bootstrapping the documents of collection '{self.collection_name}': {e}")
+            return None
+
+    def _ensure_documents(self, *doc_names: str):
+        """
+        Bootstraps the required documents before the first write to any of them in this process.
+        Writes to other documents, or after a successful bootstrap, send no extra request.
+        """
+        if self.collection_name in _bootstrapped_collections or not set(doc_names) & set(self.documents):
+            return
+        with _bootstrap_lock:
+            if self.collection_name in _bootstrapped_collections:
+                return
+            if self.bootstrap_documents() is not None:
+                _bootstrapped_collections.add(self.collection_name)
+
+    def _document(self, doc_name: str):
+        """
+        Returns the reference of a document of the collection.
+        """
+        return self.client.collection(self.collection_name).document(doc_name)
+
+    def _cache_for(self, doc_name: str):
+        """
+        Returns the cache of a document, or None if its reads are not cached. Only the page
+        documents are cached.
+        """
+        return self.cache if doc_name in self.documents else None
+
+    def _invalidate(self, *doc_names: str):
+        """
+        Drops the cached copies of written documents.
+        """
+        if self.cache is not None:
+            for doc_name in doc_names:
+                self.cache.invalidate(doc_name)
+
+    def _set_merged(self, doc_name: str, data: dict):
+        """
+        Writes the given fields of a document, creating it if needed, and invalidates its cached copy.
+        """
+        self._ensure_documents(doc_name)
+        try:
+            self._document(doc_name).set(data, merge=list(data))
+        finally:
+            self._invalidate(doc_name)
+
+    def _bulk_set(self, writes: list) -> list:
+        """
+        Sends merged writes in parallel with a BulkWriter, retrying failed ones. A BulkWriter drops
+        the writes it gives up on without raising, so their failures are collected here.
+        Args:
+            writes (list): The (document reference, data, merge) of every write.
+        Returns:
+            list: The path and error message of every write that failed.
+        """
+        failures = []
+        failures_lock = threading.Lock()
+
+        def on_write_error(error, bulk_writer) -> bool:
+            if error.attempts < BULK_WRITE_MAX_ATTEMPTS:
+                return True
+            with failures_lock:
+                failures.append((error.operation.reference.path, error.message))
+            return False
+
+        bulk_writer = self.client.bulk_writer()
+        bulk_writer.on_write_error(on_write_error)
+        for doc_ref, data, merge in writes:
+            bulk_writer.set(doc_ref, data, merge=merge)
+        bulk_writer.close()
+        for path, message in failures:
+            logging.error(f"Error writing document '{path}': {message}")
+        return failures
+
+    def close(self):
+        """
+        Closes the document listeners of the cache, if any. The cache is shared, so the listeners
+        stop for every manager of the collection, whose reads are then revalidated instead.
+        """
+        if self.cache is not None:
+            self.cache.close()
 
     def _convert_to_dict(self, data):
         """
         Converts an object to a dictionary if it is a dataclass, otherwise returns it as is.
+        Models use their generated serializer, which does not deep-copy the object like `asdict`.
         Args:
             data: The data to convert.
         Returns:
             dict: The converted dictionary or the original data.
         """
+        if isinstance(data, Model):
+            return data.to_dict()
         if hasattr(data, "__dataclass_fields__"):
             return asdict(data)
         return data
 
+    def _merge_data(self, data: dict | object) -> dict:
+        """
+        Converts update data to a dictionary stamped with the update time.
+        """
+        return {**self._convert_to_dict(data), "lastUpdated": firestore.SERVER_TIMESTAMP}
+
     def update_document(self, doc_name: str, data: dict | object):
         """
         Updates or creates a document in the Firestore collection.
@@ -72,33 +287,62 @@ class FirestoreManager:
             doc_name (str): The name of the document to update or create.
             data (dict | object): The data to update the document with.
         """
-        doc_ref = self.client.collection(self.collection_name).document(doc_name)
         try:
-            data = self._convert_to_dict(data)
-            data["lastUpdated"] = firestore.SERVER_TIMESTAMP
-            if doc_ref.get().exists:
-                doc_ref.update(data)
-                logging.info(f"Document '{doc_name}' updated successfully.")
-            else:
-                doc_ref.set(data)
-                logging.info(f"Document '{doc_name}' created successfully.")
+            data = self._merge_data(data)
+            # Merging the given fields only updates them, or creates the document if needed
+            self._set_merged(doc_name, data)
+            logging.info(f"Document '{doc_name}' updated successfully.")
         except Exception as e:
             logging.error(f"Error updating document '{doc_name}': {e}")
 
+    def update_documents(self, updates: dict, atomic: bool = True):
+        """
+        Updates or creates several documents with as few round trips as possible.
+        Args:
+            updates (dict): A dictionary mapping document names to the data to update them with.
+            atomic (bool): Whether to write the documents in atomic batches of up to 500 writes.
+                Otherwise a BulkWriter sends the writes in parallel, retrying failed ones,
+                which is faster for many documents but not atomic.
+        Returns:
+            bool: True if every document was written, False otherwise.
+        """
+        try:
+            self._ensure_documents(*updates)
+            items = [(self._document(doc_name), self._merge_data(data)) for doc_name, data in updates.items()]
+            if atomic:
+                for start in range(0, len(items), BATCH_WRITE_LIMIT):
+                    batch = self.client.batch()
+                    for doc_ref, data in items[start:start + BATCH_WRITE_LIMIT]:
+                        batch.set(doc_ref, data, merge=list(data))
+                    batch.commit()
+            else:
+                failures = self._bulk_set([(doc_ref, data, list(data)) for doc_ref, data in items])
+                if failures:
+                    logging.error(f"{len(failures)} of {len(items)} documents could not be updated.")
+                    return False
+            logging.info(f"{len(items)} documents updated successfully.")
+            return True
+        except Exception as e:
+            logging.error(f"Error updating documents {list(updates)}: {e}")
+            return False
+        finally:
+            self._invalidate(*updates)
+
     def append_doc_field_list(self, doc_name: str, field_name: str, new_data: any):
         """
         Appends data to a list field in a Firestore document.
+        The value is appended on the server with ArrayUnion, without reading the field first: a
+        missing field is created as a list, and a field that is not a list is replaced by a list
+        holding only the value instead of raising a TypeError.
         Args:
             doc_name (str): The name of the document to update.
             field_name (str): The name of the list field to append data to.
-            new_data (any): The data to append. Can be a single object or a list of objects.
+            new_data (any): The data to append. It is not appended again if the list already holds an equal value.
         """
         try:
-            field_data = self.read_field(doc_name, field_name)
-            if not isinstance(field_data, list):
-                raise TypeError(f"Field '{field_name}' is not a list.")
-            field_data.append(new_data)
-            self.update_field(doc_name, field_name, field_data)
+            # ArrayUnion appends atomically on the server, without reading the list first
+            data = self._merge_data({field_name: firestore.ArrayUnion([self._convert_to_dict(new_data)])})
+            self._set_merged(doc_name, data)
             logging.info(f"Data successfully appended to list field '{field_name}' in document '{doc_name}'.")
         except Exception as e:
             logging.error(f"Error appending to list field '{field_name}' in document '{doc_name}': {e}")
@@ -111,35 +355,283 @@ class FirestoreManager:
             field_name (str): The name of the field to update.
             value (any): The new value for the field.
         """
-        doc_ref = self.client.collection(self.collection_name).document(doc_name)
         try:
-            data = {
-                field_name: value,
-                "lastUpdated": firestore.SERVER_TIMESTAMP
-            }
-            if doc_ref.get().exists:
-                doc_ref.update(data)
-                logging.info(f"Field '{field_name}' updated successfully in document '{doc_name}'.")
-            else:
-                doc_ref.set(data)
-                logging.info(f"Document '{doc_name}' created and field '{field_name}' added successfully.")
+            data = self._merge_data({field_name: value})
+            self._set_merged(doc_name, data)
+            logging.info(f"Field '{field_name}' updated successfully in document '{doc_name}'.")
         except Exception as e:
             logging.error(f"Error updating field '{field_name}' in document '{doc_name}': {e}")
 
+    def _transactional_update_lists(self, updates: list, writes: list = ()) -> bool:
+        """
+        Runs read-modify-write updates of list fields, possibly of several documents, in one
+        transaction, retried by Firestore if any of the documents changes concurrently.
+        Args:
+            updates (list): (doc_name, field_name, mutate) tuples. `mutate` receives the current list
+                and returns the new list, or None to leave it unchanged.
+            writes (list): (doc_ref, data) tuples of documents to overwrite in the same transaction,
+                or to delete when data is None.
+        Returns:
+            bool: True if any list was changed or any document written, False otherwise.
+        """
+        self._ensure_documents(*(doc_name for doc_name, _, _ in updates))
+        refs = [(self._document(doc_name), field_name, mutate) for doc_name, field_name, mutate in updates]
+
+        @firestore.transactional
+        def update_in_transaction(transaction):
+            # Transactions must read every document before writing any
+            current = []
+            for doc_ref, field_name, _ in refs:
+                snapshot = doc_ref.get(field_paths=[field_name], transaction=transaction)
+                items = (snapshot.to_dict() or {}).get(field_name) if snapshot.exists else None
+                current.append(list(items or []))
+            changed = False
+            for (doc_ref, field_name, mutate), items in zip(refs, current):
+                new_items = mutate(items)
+                if new_items is None:
+                    continue
+                data = self._merge_data({field_name: new_items})
+                transaction.set(doc_ref, data, merge=list(data))
+                changed = True
+            for doc_ref, data in writes:
+                if data is None:
+                    transaction.delete(doc_ref)
+                else:
+                    transaction.set(doc_ref, data)
+            return changed or bool(writes)
+
+        try:
+            return update_in_transaction(self.client.transaction())
+        finally:
+            self._invalidate(*(doc_name for doc_name, _, _ in updates))
+
+    def _transactional_update_list(self, doc_name: str, field_name: str, mutate, writes: list = ()) -> bool:
+        """
+        Runs a read-modify-write update of a list field in a transaction, along with the updates of
+        the lists mirroring it.
+        Args:
+            doc_name (str): The name of the document to update.
+            field_name (str): The name of the list field to update.
+            mutate (callable): Receives a list and a function converting an item of the updated list
+                to an item of that list, and returns the new list, or None to leave it unchanged.
+            writes (list): (doc_ref, data) tuples of documents to overwrite or delete in the same transaction.
+        Returns:
+            bool: True if the list was changed or any document written, False otherwise.
+        """
+        updates = [(doc_name, field_name, lambda items: mutate(items, lambda item: item))]
+        for mirror_doc_name, mirror_field_name, convert in LIST_MIRRORS.get((doc_name, field_name), []):
+            updates.append((mirror_doc_name, mirror_field_name, lambda items, convert=convert: mutate(items, convert)))
+        return self._transactional_update_lists(updates, writes)
+
+    def replace_list_item(self, doc_name: str, field_name: str, new_item: any, key: str = "id") -> bool:
+        """
+        Replaces the item of a list field whose key matches the key of the new item, in a transaction.
+        Args:
+            doc_name (str): The name of the document to update.
+            field_name (str): The name of the list field to update.
+            new_item (any): The new item.
+            key (str): The item field identifying an item.
+        Returns:
+            bool: True if an item was replaced, False if no item matched or the update failed.
+        """
+        new_item = self._convert_to_dict(new_item)
+
+        def replace(items, convert):
+            index = _find_item(items, key, new_item[key])
+            if index is None:
+                return None
+            items[index] = convert(new_item)
+            return items
+
+        try:
+            replaced = self._transactional_update_list(doc_name, field_name, replace)
+            if replaced:
+                logging.info(f"Item '{new_item[key]}' replaced in list field '{field_name}' of document '{doc_name}'.")
+            else:
+                logging.warning(f"No item '{new_item[key]}' in list field '{field_name}' of document '{doc_name}'.")
+            return replaced
+        except Exception as e:
+            logging.error(f"Error replacing an item of list field '{field_name}' in document '{doc_name}': {e}")
+            return False
+
+    def upsert_item(self, doc_name: str, field_name: str, item: any, key: str = "id") -> bool:
+        """
+        Replaces the item of a list field whose key matches the key of the given item, or appends the
+        item if there is none, in a transaction. Lists mirroring the updated list, such as the project
+        summaries of the home page, are updated in the same transaction.
+        Args:
+            doc_name (str): The name of the document to update.
+            field_name (str): The name of the list field to update.
+            item (any): The item to insert or update.
+            key (str): The item field identifying an item.
+        Returns:
+            bool: True if the item was written, False if the update failed.
+        """
+        item = self._convert_to_dict(item)
+        try:
+            self._transactional_update_list(doc_name, field_name, _upserter(item, key))
+            logging.info(f"Item '{item[key]}' upserted in list field '{field_name}' of document '{doc_name}'.")
+            return True
+        except Exception as e:
+            logging.error(f"Error upserting item '{item.get(key)}' in list field '{field_name}' of document '{doc_name}': {e}")
+            return False
+
+    def remove_item(self, doc_name: str, field_name: str, key_value: any, key: str = "id") -> bool:
+        """
+        Removes the item of a list field with the given key, in a transaction, along with its
+        counterpart in the lists mirroring the updated list.
+        Args:
+            doc_name (str): The name of the document to update.
+            field_name (str): The name of the list field to update.
+            key_value (any): The key of the item to remove.
+            key (str): The item field identifying an item.
+        Returns:
+            bool: True if an item was removed, False if no item matched or the update failed.
+        """
+        try:
+            removed = self._transactional_update_list(doc_name, field_name, _remover(key_value, key))
+            if removed:
+                logging.info(f"Item '{key_value}' removed from list field '{field_name}' of document '{doc_name}'.")
+            else:
+                logging.warning(f"No item '{key_value}' in list field '{field_name}' of document '{doc_name}'.")
+            return removed
+        except Exception as e:
+            logging.error(f"Error removing item '{key_value}' from list field '{field_name}' of document '{doc_name}': {e}")
+            return False
+
+    def _entity(self, collection_name: str, entity_id: str):
+        """
+        Returns the reference of the document of an entity.
+        """
+        doc_name, _, _ = ENTITY_COLLECTIONS[collection_name]
+        return self._document(doc_name).collection(collection_name).document(entity_id)
+
+    def upsert_entity(self, collection_name: str, entity: any, key: str = "id") -> bool:
+        """
+        Writes the document of an entity and upserts its summary in its page document, and in the
+        lists mirroring it, in one transaction. The entity is validated against its model first,
+        so that invalid entities are never written.
+        Args:
+            collection_name (str): The entity collection: 'projects', 'codelabs' or 'testimonials'.
+            entity (any): The entity to write.
+            key (str): The entity field identifying an entity.
+        Returns:
+            bool: True if the entity was written, False if it is invalid or the update failed.
+        """
+        entity = self._convert_to_dict(entity)
+        doc_name, model, summarize = ENTITY_COLLECTIONS[collection_name]
+        try:
+            entity = model.parse(entity).to_dict()
+        except ModelValidationError as e:
+            entity_id = entity.get(key) if isinstance(entity, dict) else None
+            logging.error(f"Invalid entity '{entity_id}' of collection '{collection_name}': {e}")
+            return False
+        try:
+            self._transactional_update_list(
+                doc_name, collection_name, _upserter(summarize(entity), key),
+                writes=[(self._entity(collection_name, entity[key]), self._merge_data(entity))],
+            )
+            logging.info(f"Entity '{entity[key]}' of collection '{collection_name}' upserted successfully.")
+            return True
+        except Exception as e:
+            logging.error(f"Error upserting entity '{entity.get(key)}' of collection '{collection_name}': {e}")
+            return False
+
+    def remove_entity(self, collection_name: str, entity_id: str, key: str = "id") -> bool:
+        """
+        Deletes the document of an entity and removes its summary from its page document, and from
+        the lists mirroring it, in one transaction.
+        Args:
+            collection_name (str): The entity collection: 'projects', 'codelabs' or 'testimonials'.
+            entity_id (str): The id of the entity to remove.
+            key (str): The summary field identifying an entity.
+        Returns:
+            bool: True if the entity was removed, False if the update failed.
+        """
+        doc_name, _, _ = ENTITY_COLLECTIONS[collection_name]
+        try:
+            self._transactional_update_list(
+                doc_name, collection_name, _remover(entity_id, key),
+                writes=[(self._entity(collection_name, entity_id), None)],
+            )
+            logging.info(f"Entity '{entity_id}' of collection '{collection_name}' removed successfully.")
+            return True
+        except Exception as e:
+            logging.error(f"Error removing entity '{entity_id}' of collection '{collection_name}': {e}")
+            return False
+
+    def read_entity(self, collection_name: str, entity_id: str) -> dict | None:
+        """
+        Reads the document of a single entity, e.g. a project with all its sections.
+        Args:
+            collection_name (str): The entity collection: 'projects', 'codelabs' or 'testimonials'.
+            entity_id (str): The id of the entity.
+        Returns:
+            dict: The entity, or None if it does not exist.
+        """
+        try:
+            doc = self._entity(collection_name, entity_id).get()
+            if doc.exists:
+                logging.info(f"Entity '{entity_id}' of collection '{collection_name}' fetched successfully.")
+                return doc.to_dict()
+            logging.warning(f"Entity '{entity_id}' of collection '{collection_name}' does not exist.")
+            return None
+        except Exception as e:
+            logging.error(f"Error reading entity '{entity_id}' of collection '{collection_name}': {e}")
+            return None
+
+    def split_page_documents(self, key: str = "id") -> bool:
+        """
+        Migrates page documents holding full entities to the entity layout: every entity of a page
+        list is written to its own document, and the list is replaced by the entity summaries.
+        Running it again on migrated documents rewrites the same summaries, and migrates the
+        collections left unchanged by a failed run.
+        Args:
+            key (str): The entity field identifying an entity.
+        Returns:
+            bool: True if every collection was migrated, False otherwise.
+        """
+        try:
+            migrated = True
+            for collection_name, (doc_name, _, summarize) in ENTITY_COLLECTIONS.items():
+                snapshot = self._document(doc_name).get(field_paths=[collection_name])
+                items = ((snapshot.to_dict() or {}).get(collection_name) if snapshot.exists else None) or []
+                # Merging keeps the fields of entities whose page item already is a summary
+                failures = self._bulk_set([
+                    (self._entity(collection_name, item[key]), self._merge_data(item), True) for item in items
+                ])
+                if failures:
+                    # The page list stays the only full copy of the entities that were not written
+                    logging.error(f"{len(failures)} entities of collection '{collection_name}' could not be written, its page list is left unchanged.")
+                    migrated = False
+                    continue
+                data = self._merge_data({collection_name: [summarize(item) for item in items]})
+                self._set_merged(doc_name, data)
+                logging.info(f"{len(items)} entities of collection '{collection_name}' migrated successfully.")
+            return migrated
+        except Exception as e:
+            logging.error(f"Error migrating page documents to entity collections: {e}")
+            return False
+
     def read_document(self, doc_name: str) -> dict | None:
         """
-        Reads a document from the Firestore collection.
+        Reads a document from the Firestore collection, from the cache for page documents.
         Args:
             doc_name (str): The name of the document to read.
         Returns:
             dict: The data of the document, or None if it does not exist.
         """
-        doc_ref = self.client.collection(self.collection_name).document(doc_name)
+        doc_ref = self._document(doc_name)
+        cache = self._cache_for(doc_name)
         try:
-            doc = doc_ref.get()
-            if doc.exists:
+            if cache is not None:
+                exists, data = cache.get_document(doc_name, doc_ref)
+            else:
+                doc = doc_ref.get()
+                exists, data = doc.exists, doc.to_dict() if doc.exists else None
+            if exists:
                 logging.info(f"Document '{doc_name}' fetched successfully.")
-                return doc.to_dict()
+                return data
             else:
                 logging.warning(f"Document '{doc_name}' does not exist.")
                 return None
@@ -149,21 +641,27 @@ class FirestoreManager:
 
     def read_field(self, doc_name: str, field_name: str) -> any:
         """
-        Reads a specific field from a Firestore document.
+        Reads a specific field from a Firestore document. Only the field is downloaded, or it is
+        served from the cache for page documents.
         Args:
             doc_name (str): The name of the document to read.
             field_name (str): The name of the field to fetch.
         Returns:
             Any: The value of the field, or None if the document or field does not exist.
         """
-        doc_ref = self.client.collection(self.collection_name).document(doc_name)
+        doc_ref = self._document(doc_name)
+        cache = self._cache_for(doc_name)
         try:
-            doc = doc_ref.get()
-            if doc.exists:
-                doc_data = doc.to_dict()
-                if field_name in doc_data:
+            if cache is not None:
+                exists, has_field, value = cache.get_field(doc_name, field_name, doc_ref)
+            else:
+                doc = doc_ref.get(field_paths=[field_name])
+                doc_data = (doc.to_dict() or {}) if doc.exists else {}
+                exists, has_field, value = doc.exists, field_name in doc_data, doc_data.get(field_name)
+            if exists:
+                if has_field:
                     logging.info(f"Field '{field_name}' in document '{doc_name}' fetched successfully.")
-                    return doc_data[field_name]
+                    return value
                 else:
                     logging.warning(f"Field '{field_name}' does not exist in document '{doc_name}'.")
                     return None
@@ -1,31 +1,136 @@
 import re
 from config.auth import get_cloud_storage_client
+from config.settings import GCS_IMAGE_UPLOAD_CONCURRENCY, PUBLISHED_IMAGE_CACHE_SIZE, IMAGE_TRANSCODE_ENABLED, IMAGE_MAX_WIDTH, IMAGE_MAX_HEIGHT, IMAGE_WEBP_QUALITY
+from utils.image_handler import detect_image_mime_type, image_extension, transcode_image, TRANSCODABLE_MIME_TYPES
+from concurrent.futures import ThreadPoolExecutor
+from cachetools import LRUCache
+from google.api_core.exceptions import PreconditionFailed
 import base64
-from uuid import uuid4
+import hashlib
+import threading
+
+# Matches base64 image data in markdown-style image definitions, e.g. `[image1]: <data:image/png;base64,...>`.
+# The `uri` group spans the angle brackets and is what gets replaced by the public URL.
+IMAGE_DEFINITION_PATTERN = re.compile(
+    r'\[[^\]\n]*\]:[ \t]*(?P<uri><data:image/(?P<subtype>[a-zA-Z0-9.+-]+);base64,(?P<data>[^>]+)>)'
+)
+
+# Process-wide cache of the images already known to be in a bucket, keyed by (bucket name, blob name)
+_published_images = LRUCache(maxsize=PUBLISHED_IMAGE_CACHE_SIZE)
+_published_images_lock = threading.Lock()
 
 class GcsManager:
     """
     Service class for interacting with Google Cloud Storage (GCS),
     providing helpers for extracting, uploading, and replacing base64-encoded 
     images within file content.
+
+    Images are stored under the SHA-256 digest of their content, so an image that is already in
+    the bucket is never uploaded again; its existing public URL is reused instead. The MIME type
+    of every image is detected from its magic bytes, and raster images can optionally be
+    downsized and converted to WebP before upload. Images that fail to transcode are uploaded as is.
+
+    Attributes:
+        upload_stats (dict): Counters of cache hits, bucket hits, uploads, uploaded bytes and transcoding failures.
     """
 
-    def __init__(self, bucket_name: str):
+    def __init__(self, bucket_name: str, max_upload_workers: int = GCS_IMAGE_UPLOAD_CONCURRENCY,
+                 transcode: bool = IMAGE_TRANSCODE_ENABLED, max_image_width: int = IMAGE_MAX_WIDTH,
+                 max_image_height: int = IMAGE_MAX_HEIGHT, webp_quality: int = IMAGE_WEBP_QUALITY):
         """
         Initializes the GcsManager with a GCS client and a bucket reference.
 
         Args:
             bucket_name (str): The name of the Google Cloud Storage bucket.
+            max_upload_workers (int, optional): The maximum number of images decoded and uploaded at the same time.
+            transcode (bool, optional): Whether to downsize raster images and convert them to WebP before upload.
+            max_image_width (int, optional): The maximum width of transcoded images in pixels.
+            max_image_height (int, optional): The maximum height of transcoded images in pixels.
+            webp_quality (int, optional): The quality of transcoded images, from 0 to 100.
         """
         self.client = get_cloud_storage_client()
         self.bucket_name = bucket_name  # Cloud Storage bucket name
         self.bucket = self.client.bucket(bucket_name)
+        self.max_upload_workers = max_upload_workers
+        self.transcode = transcode
+        self.max_image_width = max_image_width
+        self.max_image_height = max_image_height
+        self.webp_quality = webp_quality
+        self.upload_stats = {"cache_hits": 0, "bucket_hits": 0, "uploads": 0, "uploaded_bytes": 0, "transcode_failures": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, **increments):
+        """
+        Increments the upload counters in a thread-safe way.
+        """
+        with self._stats_lock:
+            for name, increment in increments.items():
+                self.upload_stats[name] += increment
+
+    def _upload_image(self, image_base64: str, declared_subtype: str = None, transcode: bool = True) -> str:
+        """
+        Decodes a base64 image and uploads it to the bucket under its content hash, unless an
+        identical image is already known to the in-process cache or present in the bucket.
+
+        Args:
+            image_base64 (str): The base64-encoded image data.
+            declared_subtype (str, optional): The image subtype declared by the data URI, used only
+                when the format cannot be detected from the data itself.
+            transcode (bool, optional): Whether the image may be transcoded, when transcoding is enabled.
+                Images that cannot be decoded, e.g. corrupt data or decompression bombs, are uploaded
+                untranscoded instead.
+
+        Returns:
+            str: The public URL of the image.
+        """
+        # Decode the base64 image data
+        image_data = base64.b64decode(image_base64)
+        fallback_type = f"image/{declared_subtype}" if declared_subtype else "application/octet-stream"
+        content_type = detect_image_mime_type(image_data, fallback=fallback_type)
+        # Name the image after its content so that identical images share one object. Transcoded
+        # variants get a suffix describing the transcoding settings, since they hold different bytes.
+        name = hashlib.sha256(image_data).hexdigest()
+        transcode = transcode and self.transcode and content_type in TRANSCODABLE_MIME_TYPES
+        if transcode:
+            name += f"-{self.max_image_width}x{self.max_image_height}q{self.webp_quality}"
+            content_type = "image/webp"
+        file_name = f"images/{name}.{image_extension(content_type)}"
+        cache_key = (self.bucket_name, file_name)
+        with _published_images_lock:
+            public_url = _published_images.get(cache_key)
+        if public_url is not None:
+            self._count(cache_hits=1)
+            return public_url
+        blob = self.bucket.blob(file_name)
+        if blob.exists():
+            self._count(bucket_hits=1)
+        else:
+            if transcode:
+                try:
+                    image_data = transcode_image(image_data, self.max_image_width, self.max_image_height, self.webp_quality)
+                except Exception as e:
+                    # Publish the original bytes under their untranscoded name and detected type instead
+                    print(f"Error transcoding image '{file_name}', uploading the original image: {e}")
+                    self._count(transcode_failures=1)
+                    return self._upload_image(image_base64, declared_subtype, transcode=False)
+            try:
+                # Only create the object if no concurrent upload created it first
+                blob.upload_from_string(image_data, content_type=content_type, if_generation_match=0)
+                self._count(uploads=1, uploaded_bytes=len(image_data))
+            except PreconditionFailed:
+                self._count(bucket_hits=1)
+        with _published_images_lock:
+            _published_images[cache_key] = blob.public_url
+        return blob.public_url
 
     def publish_image_assets(self, file_content: str):
         """
         Replaces base64 images in the input content with the corresponding public URLs
         after uploading the image assets to the Google Cloud Storage bucket.
 
+        The content is scanned once for image definitions, the images are decoded and uploaded
+        concurrently on a bounded thread pool, and the modified content is assembled in a single join.
+
         Args:
             file_content (str): Content containing base64-encoded images to be uploaded to GCS.
 
@@ -34,39 +139,27 @@ class GcsManager:
                 - Modified content with public URLs in place of base64 data.
                 - A list of dictionaries containing original base64 data and public URLs.
         """
-        # Regex pattern to match base64 image data in markdown-style image syntax
-        image_pattern = r'\[.*?\]:\s*<data:image\/[a-zA-Z]+;base64,([^>]+)>'
-        # Split the file content into lines (since each image is expected to be on a new line)
-        lines = file_content.split('\n')
-        # List to store the image data and their corresponding public URLs
+        matches = list(IMAGE_DEFINITION_PATTERN.finditer(file_content))
+        if not matches:
+            return file_content, []
+        # Decode and upload every image concurrently, keeping the order of the matches
+        with ThreadPoolExecutor(max_workers=min(self.max_upload_workers, len(matches))) as executor:
+            public_urls = list(executor.map(lambda match: self._upload_image(match.group("data"), match.group("subtype")), matches))
+        # Stitch the untouched segments and the public URLs back together
+        segments = []
         image_data_with_placeholder = []
-        # Iterate through each line and look for base64 matches
-        for i, line in enumerate(lines):
-            # Search for the image pattern in the current line
-            match = re.search(image_pattern, line)
-            if match:
-                print("Match found: ", line)
-                # Extract base64 data from the match
-                image_base64 = match.group(1)
-                # Generate a unique file name for the image
-                file_name = f"images/{uuid4().hex}.png"
-                # Decode the base64 image data
-                image_data = base64.b64decode(image_base64)
-                # Upload the image to GCS
-                blob = self.bucket.blob(file_name)
-                blob.upload_from_string(image_data, content_type='image/png')
-                # Get the public URL for the uploaded image
-                public_url = blob.public_url
-                # Replace the base64 data with the public URL in the current line
-                lines[i] = line.replace(f'<data:image/png;base64,{image_base64}>', f'{public_url}')
-                # Append the original base64 data and the public URL to the list
-                image_data_with_placeholder.append({
-                    "original_base64": image_base64,
-                    "public_url": public_url
-                })
-        # Reassemble the content back into a single string
-        modified_content = '\n'.join(lines)
-        return modified_content, image_data_with_placeholder
+        position = 0
+        for match, public_url in zip(matches, public_urls):
+            segments.append(file_content[position:match.start("uri")])
+            segments.append(public_url)
+            position = match.end("uri")
+            image_data_with_placeholder.append({
+                "original_base64": match.group("data"),
+                "public_url": public_url
+            })
+        segments.append(file_content[position:])
+        print(f"Published {len(public_urls)} images to bucket '{self.bucket_name}': {self.upload_stats}")
+        return "".join(segments), image_data_with_placeholder
  
 # if __name__ == "__main__":
 #     # Test function
@@ -1,4 +1,30 @@
+from .batch_project_extractor import BatchProjectExtractor, LocalBatchBackend, VertexBatchBackend
 from .gemini_processor import GeminiProcessor
+from .project_extractor import ProjectExtractor, get_project_extractor
 from .project_response_manager import ProjectResponseManager
+from .prompt_preparer import PromptPreparer
+from .prompt_template import PrefixedPromptTemplate
+from .rate_limiter import AsyncTokenBucket
+from .response_parser import IncrementalJsonParser, MalformedResponseError
+from .response_cache import ResponseCache, MemoryResponseCache, DiskResponseCache, FirestoreResponseCache, TieredResponseCache, get_default_response_cache
 
-__all__ = ["GeminiProcessor", "ProjectResponseManager"]
\ No newline at end of file
+__all__ = [
+    "GeminiProcessor",
+    "ProjectExtractor",
+    "get_project_extractor",
+    "ProjectResponseManager",
+    "BatchProjectExtractor",
+    "LocalBatchBackend",
+    "VertexBatchBackend",
+    "PromptPreparer",
+    "PrefixedPromptTemplate",
+    "AsyncTokenBucket",
+    "IncrementalJsonParser",
+    "MalformedResponseError",
+    "ResponseCache",
+    "MemoryResponseCache",
+    "DiskResponseCache",
+    "FirestoreResponseCache",
+    "TieredResponseCache",
+    "get_default_response_cache",
+]
\ No newline at end of file
@@ -0,0 +1,265 @@
+from config.auth import get_cloud_storage_client
+from config.settings import GEMINI_MODEL, GEMINI_BATCH_BUCKET, GEMINI_BATCH_POLL_SECONDS
+from .prompt_preparer import PromptPreparer
+from .derived_fields import derive_project_fields
+from .project_extractor import build_project_prompt_template, complete_project, decode_project_response
+from .values.base_project_template_values import PROJECT_GENERATION_CONFIG
+from vertexai.batch_prediction import BatchPredictionJob
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from uuid import uuid4
+
+def _prompt_hash(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+def _request_text(line):
+    return line["request"]["contents"][0]["parts"][0]["text"]
+
+def _generation_config(line):
+    """
+    Returns the generation config of a request line with the keys of the Vertex AI SDK, e.g.
+    'response_schema' for the 'responseSchema' of the batch request format.
+    """
+    config = line["request"].get("generationConfig", {})
+    return {re.sub(r'(?<!^)(?=[A-Z])', '_', key).lower(): value for key, value in config.items()}
+
+def _response_text(line):
+    return line["response"]["candidates"][0]["content"]["parts"][0]["text"]
+
+class LocalBatchBackend:
+    """
+    Serves a JSONL batch request file locally, one request at a time, writing the results in the
+    Vertex AI batch prediction output format. Useful for tests and small offline regenerations.
+
+    Attributes:
+        generate (callable): Generates the response text of a prompt, e.g. `GeminiProcessor.generate_content_from_text`
+            or a stub returning canned responses. It is called with the `generation_config` of the request,
+            holding the response schema, as a keyword argument.
+    """
+
+    def __init__(self, generate):
+        """
+        Initializes the backend.
+
+        Args:
+            generate (callable): Generates the response text of a prompt, given its `generation_config`.
+        """
+        self.generate = generate
+
+    def run(self, input_path):
+        """
+        Serves every request of the input file and yields each output line as soon as it is written.
+
+        Args:
+            input_path (str): The path of the JSONL request file.
+
+        Yields:
+            dict: One output line, holding the original 'request' and either a 'response' or a 'status' error.
+        """
+        output_path = f"{os.path.splitext(input_path)[0]}.predictions.jsonl"
+        with open(input_path, "r", encoding="utf-8") as input_file, open(output_path, "w", encoding="utf-8") as output_file:
+            for raw_line in input_file:
+                line = json.loads(raw_line)
+                try:
+                    text = self.generate(_request_text(line), generation_config=_generation_config(line))
+                    line["response"] = {"candidates": [{"content": {"role": "model", "parts": [{"text": text}]}}]}
+                except Exception as e:
+                    line["status"] = str(e)
+                output_file.write(json.dumps(line) + "\n")
+                yield line
+
+class VertexBatchBackend:
+    """
+    Runs a JSONL batch request file as a Vertex AI batch prediction job. The request file is
+    uploaded to Cloud Storage, the job is polled until it ends, and the output files are streamed
+    back line by line.
+
+    Attributes:
+        bucket_name (str): The bucket holding the batch input and output files.
+        model_name (str): The Gemini model serving the batch.
+        poll_seconds (float): The delay between two job status checks.
+    """
+
+    def __init__(self, bucket_name=GEMINI_BATCH_BUCKET, model_name=GEMINI_MODEL, poll_seconds=GEMINI_BATCH_POLL_SECONDS):
+        """
+        Initializes the backend.
+
+        Args:
+            bucket_name (str, optional): The bucket holding the batch input and output files.
+            model_name (str, optional): The Gemini model serving the batch.
+            poll_seconds (float, optional): The delay between two job status checks.
+        """
+        self.client = get_cloud_storage_client()
+        self.bucket_name = bucket_name
+        self.model_name = model_name
+        self.poll_seconds = poll_seconds
+
+    def run(self, input_path):
+        """
+        Submits the request file as a batch prediction job and yields its output lines.
+
+        Args:
+            input_path (str): The path of the JSONL request file.
+
+        Yields:
+            dict: One output line, holding the original 'request' and either a 'response' or a 'status' error.
+
+        Raises:
+            RuntimeError: If the batch prediction job fails.
+        """
+        prefix = f"batch/{uuid4().hex}"
+        bucket = self.client.bucket(self.bucket_name)
+        bucket.blob(f"{prefix}/input.jsonl").upload_from_filename(input_path, content_type="application/jsonl")
+        job = BatchPredictionJob.submit(
+            source_model=self.model_name,
+            input_dataset=f"gs://{self.bucket_name}/{prefix}/input.jsonl",
+            output_uri_prefix=f"gs://{self.bucket_name}/{prefix}/output"
+        )
+        logging.info(f"Submitted batch prediction job {job.resource_name}.")
+        while not job.has_ended:
+            time.sleep(self.poll_seconds)
+            job.refresh()
+        if not job.has_succeeded:
+            raise RuntimeError(f"Batch prediction job {job.resource_name} failed: {job.error}")
+        # The output location is a gs:// URI of a folder holding one or more predictions files
+        output_bucket, _, output_prefix = job.output_location.removeprefix("gs://").partition("/")
+        for blob in self.client.list_blobs(output_bucket, prefix=output_prefix):
+            if not blob.name.endswith(".jsonl"):
+                continue
+            with blob.open("r", encoding="utf-8") as output_file:
+                for raw_line in output_file:
+                    yield json.loads(raw_line)
+
+class BatchProjectExtractor:
+    """
+    Extracts projects from many readmes at once, for bulk re-generation after a template change.
+
+    All prompts are rendered in one pass into a JSONL request file, which a batch backend serves:
+    a Vertex AI batch prediction job, or a local backend. Results are parsed as they stream back
+    and matched to their readme through the hash of the prompt echoed in every output line.
+
+    Attributes:
+        backend (VertexBatchBackend | LocalBatchBackend): The backend serving the request file.
+        prompt_preparer (PromptPreparer): Strips images from the readmes and restores them in the results.
+        prompt_template (PrefixedPromptTemplate): The project prompt template.
+    """
+
+    def __init__(self, backend=None, work_dir=None):
+        """
+        Initializes the BatchProjectExtractor.
+
+        Args:
+            backend (VertexBatchBackend | LocalBatchBackend, optional): The backend serving the request file.
+                Defaults to a Vertex AI batch prediction backend.
+            work_dir (str, optional): The directory of the request files. Defaults to a temporary directory.
+        """
+        self.backend = backend or VertexBatchBackend()
+        self.prompt_preparer = PromptPreparer()
+        self.prompt_template = build_project_prompt_template()
+        self.work_dir = work_dir
+
+    def write_request_file(self, readmes):
+        """
+        Renders the prompt of every readme and writes them to a JSONL request file.
+
+        Args:
+            readmes (dict): A dictionary mapping stable keys (e.g. Drive file ids) to readme contents. The key is
+                the project id of a readme without a stamped File Id.
+
+        Returns:
+            tuple: A tuple containing:
+                - str: The path of the request file.
+                - dict: A dictionary mapping each prompt hash to the derived fields and image
+                  placeholders of its readmes, by key.
+                - dict: A dictionary mapping the keys of the readmes left out of the batch to the reason why.
+        """
+        if self.work_dir is None:
+            self.work_dir = tempfile.mkdtemp()
+        path = os.path.join(self.work_dir, f"requests-{uuid4().hex}.jsonl")
+        pending = {}
+        rejected = {}
+        with open(path, "w", encoding="utf-8") as request_file:
+            for key, readme in readmes.items():
+                stripped_readme, placeholders = self.prompt_preparer.strip_images(readme)
+                prompt = self.prompt_template.render(input_readme=stripped_readme)
+                try:
+                    derived_fields = derive_project_fields(readme, key)
+                    self.prompt_preparer.enforce_budget(prompt)
+                except ValueError as e:
+                    rejected[key] = str(e)
+                    continue
+                prompt_hash = _prompt_hash(prompt)
+                if prompt_hash in pending:
+                    # Readmes with identical prompts share one request. They may still differ by their
+                    # images, so placeholders are restored per readme.
+                    pending[prompt_hash]["derived_fields"][key] = derived_fields
+                    pending[prompt_hash]["placeholders"][key] = placeholders
+                    continue
+                pending[prompt_hash] = {
+                    "derived_fields": {key: derived_fields},
+                    "placeholders": {key: placeholders},
+                }
+                request = {"request": {
+                    "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                    "generationConfig": {
+                        "responseMimeType": PROJECT_GENERATION_CONFIG["response_mime_type"],
+                        "responseSchema": PROJECT_GENERATION_CONFIG["response_schema"],
+                    },
+                }}
+                request_file.write(json.dumps(request) + "\n")
+        logging.info(f"Wrote {len(pending)} batch requests to {path}.")
+        return path, pending, rejected
+
+    def extract(self, readmes):
+        """
+        Extracts the project of every readme through the batch backend.
+
+        Args:
+            readmes (dict): A dictionary mapping stable keys (e.g. Drive file ids) to readme contents. The key is
+                the project id of a readme without a stamped File Id.
+
+        Yields:
+            tuple: A (key, project, error) tuple per readme, as soon as its result is available. `project`
+                is the extracted project dictionary, or None if the extraction failed, in which case
+                `error` describes the failure.
+        """
+        path, pending, rejected = self.write_request_file(readmes)
+        for key, error in rejected.items():
+            yield key, None, error
+        for line in self.backend.run(path):
+            entry = pending.pop(_prompt_hash(_request_text(line)), None)
+            if entry is None:
+                continue
+            data, error = None, line.get("status") or None
+            if error is None:
+                try:
+                    data = decode_project_response(_response_text(line))
+                except (KeyError, IndexError, ValueError) as e:
+                    error = f"Invalid batch response: {e}"
+            for key, derived_fields in entry["derived_fields"].items():
+                if error is not None:
+                    yield key, None, error
+                    continue
+                try:
+                    project = complete_project(data, derived_fields)
+                except ValueError as e:
+                    yield key, None, f"Invalid batch response: {e}"
+                    continue
+                yield key, self.prompt_preparer.restore_images(project, entry["placeholders"][key]), None
+        # Requests missing from the output are reported as failures
+        for entry in pending.values():
+            for key in entry["derived_fields"]:
+                yield key, None, "No result returned by the batch backend."
+
+# if __name__ == "__main__":
+#     # Example usage with a local backend served by Gemini
+#     from .gemini_processor import GeminiProcessor
+#     from .values.base_project_template_values import BASE_PROJECT_TEMPLATE_VALUES
+#     extractor = BatchProjectExtractor(backend=LocalBatchBackend(GeminiProcessor().generate_content_from_text))
+#     for key, project, error in extractor.extract({"sample": BASE_PROJECT_TEMPLATE_VALUES["input_readme"]}):
+#         print(key, project, error)
@@ -0,0 +1,96 @@
+from .prompt_preparer import CHARS_PER_TOKEN
+from models import Project
+import dataclasses
+import re
+
+HEADING_PATTERN = re.compile(r'^#{1,6}[ \t]+\S', re.MULTILINE)
+PARAGRAPH_SEPARATOR_PATTERN = re.compile(r'\n[ \t]*\n')
+FIRST_VALUE_FIELDS = ["projectHeroImg", "projectTitle", "problemStatement", "demo", "author"]
+SECTION_FIELDS = ["overview", "features"]
+
+def split_markdown_sections(text):
+    """
+    Splits a markdown document before every heading. Text before the first heading is its own section.
+
+    Args:
+        text (str): The markdown document.
+
+    Returns:
+        list: The sections of the document, in order; joined together they give the document back.
+    """
+    starts = [match.start() for match in HEADING_PATTERN.finditer(text)]
+    if not starts or starts[0] != 0:
+        starts.insert(0, 0)
+    return [text[start:end] for start, end in zip(starts, starts[1:] + [len(text)]) if text[start:end].strip()]
+
+def _split_oversized(section, max_chars):
+    """
+    Splits a section longer than `max_chars` at paragraph boundaries, and paragraphs that are still
+    too long at `max_chars`.
+    """
+    pieces = []
+    for paragraph in PARAGRAPH_SEPARATOR_PATTERN.split(section):
+        pieces.extend(paragraph[start:start + max_chars] for start in range(0, len(paragraph), max_chars))
+    return pieces
+
+def chunk_markdown(text, max_tokens):
+    """
+    Splits a markdown document into chunks of at most `max_tokens` estimated tokens. Chunks are made
+    of whole sections, split at headings, so that related content stays together; sections that are
+    too long on their own are split at paragraph boundaries.
+
+    Args:
+        text (str): The markdown document.
+        max_tokens (int): The maximum number of estimated tokens per chunk.
+
+    Returns:
+        list: The chunks of the document, in order.
+    """
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    chunks = []
+    current = ""
+    for section in split_markdown_sections(text):
+        pieces = [section] if len(section) <= max_chars else _split_oversized(section, max_chars)
+        for piece in pieces:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current)
+                current = ""
+            current = f"{current}\n\n{piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def merge_partial_projects(partials):
+    """
+    Merges the generated partial projects extracted from the chunks of a document into one project.
+    The merge only depends on the partials and their order:
+
+    - single-valued fields (title, hero image, problem statement, demo...) take the first non-empty value;
+    - overview and features concatenate the text contents of every chunk, dropping duplicates.
+
+    The id, read time and links are derived from the whole document instead, see `derived_fields`.
+
+    Args:
+        partials (list): The partial project dictionaries, in document order.
+
+    Returns:
+        dict: The merged project dictionary.
+    """
+    project = {}
+    for field in FIRST_VALUE_FIELDS:
+        for partial in partials:
+            if partial.get(field):
+                project[field] = partial[field]
+                break
+    for field in SECTION_FIELDS:
+        text_contents = []
+        seen = set()
+        for partial in partials:
+            for text_content in (partial.get(field) or {}).get("textContents", []):
+                content = " ".join(text_content["content"].split())
+                if content and content not in seen:
+                    seen.add(content)
+                    text_contents.append(text_content)
+        project[field] = {"textContents": text_contents}
+    # Keep the field order of the model
+    return {field.name: project[field.name] for field in dataclasses.fields(Project) if field.name in project}
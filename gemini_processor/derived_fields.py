@@ -0,0 +1,79 @@
+import logging
+import math
+import re
+
+WORDS_PER_MINUTE = 200
+# The UUID stamped at the top of project documents by `FileHandler.update_file_with_uuid`
+FILE_ID_PATTERN = re.compile(r'^[ \t]*File Id:[ \t]*\\?"?(?P<uuid>[0-9a-fA-F]{8}(?:-[0-9a-fA-F]{4}){3}-[0-9a-fA-F]{12})', re.MULTILINE)
+INLINE_LINK_PATTERN = re.compile(r'(?<!!)\[[^\]\n]*\]\(<?(?P<url>https?://[^\s)>]+)>?\)')
+DEFINITION_PATTERN = re.compile(r'^\[(?P<label>[^\]\n]+)\]:[ \t]*<?(?P<url>https?://[^\s>]+)>?', re.MULTILINE)
+AUTOLINK_PATTERN = re.compile(r'(?<!:)(?<!: )(?<!:\t)<(?P<url>https?://[^\s>]+)>')
+IMAGE_LABEL_PATTERN = re.compile(r'!\[[^\]\n]*\]\[(?P<label>[^\]\n]+)\]')
+BARE_URL_PATTERN = re.compile(r'(?<![(<\w])https?://[^\s)>\]]+')
+URL_TRAILING_PUNCTUATION = ".,;:!?'\""
+
+def find_file_id(readme):
+    """
+    Returns the UUID stamped in a readme by `FileHandler.update_file_with_uuid`, or None.
+    """
+    match = FILE_ID_PATTERN.search(readme)
+    return match.group("uuid").lower() if match else None
+
+def count_read_time(readme):
+    """
+    Returns the read time of a readme in minutes, at 200 words per minute and at least one minute.
+    """
+    return max(1, math.ceil(len(readme.split()) / WORDS_PER_MINUTE))
+
+def find_links(readme):
+    """
+    Returns the links of a readme in order of first appearance: inline links, autolinks, reference
+    definitions and bare URLs. Images are not links.
+
+    Args:
+        readme (str): The markdown readme.
+
+    Returns:
+        list: The unique link URLs.
+    """
+    image_labels = {match.group("label").lower() for match in IMAGE_LABEL_PATTERN.finditer(readme)}
+    found = [(match.start(), match.group("url")) for match in INLINE_LINK_PATTERN.finditer(readme)]
+    found += [(match.start(), match.group("url")) for match in AUTOLINK_PATTERN.finditer(readme)]
+    found += [
+        (match.start(), match.group("url")) for match in DEFINITION_PATTERN.finditer(readme)
+        if match.group("label").lower() not in image_labels
+    ]
+    found += [(match.start(), match.group(0)) for match in BARE_URL_PATTERN.finditer(readme)]
+    # Markdown exports escape characters such as underscores in URLs
+    urls = (url.replace("\\", "").rstrip(URL_TRAILING_PUNCTUATION) for _, url in sorted(found))
+    return list(dict.fromkeys(urls))
+
+def derive_project_fields(readme, project_id=None):
+    """
+    Computes the project fields that are fully determined by the readme, so that they are neither
+    generated nor billed: the id, the read time and the relevant links.
+
+    The id must stay the same across edits of the document, so that storing a new version of a
+    project replaces the previous one: it is the stamped File Id, or else the given project id.
+
+    Args:
+        readme (str): The project readme.
+        project_id (str, optional): The id used when the readme has no stamped UUID, e.g. the Drive file id.
+
+    Returns:
+        dict: The 'id', 'readTimeInMins' and 'relevantLinks' of the project.
+
+    Raises:
+        ValueError: If the readme has no stamped File Id and no project id is given.
+    """
+    file_id = find_file_id(readme)
+    if file_id is None:
+        if not project_id:
+            raise ValueError("Readme has no stamped File Id and no project id was given, so the project has no stable id.")
+        file_id = project_id
+        logging.warning(f"Readme has no stamped File Id, using '{file_id}' as project id.")
+    return {
+        "id": file_id,
+        "readTimeInMins": count_read_time(readme),
+        "relevantLinks": find_links(readme),
+    }
@@ -1,5 +1,30 @@
 from config.auth import get_gemini_model
+from config.settings import GEMINI_MODEL, GEMINI_REQUEST_TIMEOUT_SECONDS, GEMINI_MAX_RETRIES, GEMINI_CONTEXT_CACHE_MIN_TOKENS, GEMINI_CONTEXT_CACHE_TTL_SECONDS
+from .response_cache import cache_key
+from .prompt_preparer import CHARS_PER_TOKEN
+from .rate_limiter import default_request_limiter, default_token_limiter, default_concurrency_limiter
+from google.api_core.exceptions import GoogleAPICallError
 from vertexai.generative_models import Part
+from vertexai.preview import caching
+from vertexai.preview.generative_models import GenerativeModel as PreviewGenerativeModel
+from datetime import datetime, timedelta, timezone
+import asyncio
+import copy
+import hashlib
+import logging
+import random
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RETRY_BASE_DELAY_SECONDS = 1.0
+RETRY_MAX_DELAY_SECONDS = 60.0
+
+def _is_retryable(error):
+    """
+    Returns whether a failed request should be retried: rate limiting, server errors and timeouts.
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    return isinstance(error, GoogleAPICallError) and error.code in RETRYABLE_STATUS_CODES
 
 class GeminiProcessor:
     """
@@ -12,27 +37,279 @@ class GeminiProcessor:
     2. Image-based content generation from an image and a question.
     3. Combined text and image-based content generation.
     
+    Text generation results can be served from a pluggable response cache keyed by the model name,
+    the rendered prompt and the generation config, so identical prompts never reach Vertex AI twice.
+    Callers pass a `validate` callback to only cache responses they accept, so that a malformed
+    generation is regenerated on retry instead of being replayed from the cache.
+
+    `generate_content_async` is the non-blocking counterpart of the generation methods. Its requests
+    are limited by a concurrency semaphore and by requests-per-minute and tokens-per-minute token
+    buckets, time out, and are retried with exponential backoff and jitter on rate limiting and
+    server errors. The async client of the shared model is bound to the first event loop using it,
+    so every async call of a process must run on that one loop; sync callers on worker threads use
+    the sync methods instead.
+
+    `with_cached_prefix` derives a processor whose prompts implicitly start with a static prefix
+    registered as Vertex AI cached content.
+
     Attributes:
         gemini_model (GenerativeModel): The authenticated Gemini model used for content generation.
+        model_name (str): The name of the Gemini model, part of every cache key.
+        cache (ResponseCache): The cache of generated responses, if any.
     """
 
-    def __init__(self):
+    def __init__(self, cache=None, request_limiter=default_request_limiter, token_limiter=default_token_limiter,
+                 concurrency_limiter=default_concurrency_limiter, request_timeout=GEMINI_REQUEST_TIMEOUT_SECONDS,
+                 max_retries=GEMINI_MAX_RETRIES):
         """
         Initializes the Gemini client with authentication.
+
+        Args:
+            cache (ResponseCache, optional): The cache of generated responses. Responses are not cached if omitted.
+            request_limiter (AsyncTokenBucket, optional): Limits the requests per minute of async calls.
+            token_limiter (AsyncTokenBucket, optional): Limits the tokens per minute of async calls.
+            concurrency_limiter (asyncio.Semaphore, optional): Limits the number of concurrent async calls.
+            request_timeout (float, optional): The timeout of one async request attempt, in seconds.
+            max_retries (int, optional): The maximum number of retries of a failed async request.
         """
         self.gemini_model = get_gemini_model()  # Authenticated Gemini model
+        self.model_name = GEMINI_MODEL
+        self.cache = cache
+        self.request_limiter = request_limiter
+        self.token_limiter = token_limiter
+        self.concurrency_limiter = concurrency_limiter
+        self.request_timeout = request_timeout
+        self.max_retries = max_retries
+
+    def _log_usage(self, response):
+        """
+        Logs the token counts measured by the API for a response.
+
+        Args:
+            response (GenerationResponse): The response returned by the model.
+        """
+        usage = response.usage_metadata
+        logging.info(
+            f"Gemini request used {usage.prompt_token_count} prompt tokens "
+            f"and {usage.candidates_token_count} output tokens."
+        )
+
+    def with_cached_prefix(self, prefix, ttl_seconds=GEMINI_CONTEXT_CACHE_TTL_SECONDS):
+        """
+        Registers a static prompt prefix as Vertex AI cached content, so that later requests only
+        send and bill the part of the prompt that follows it.
+
+        Args:
+            prefix (str): The static prompt prefix.
+            ttl_seconds (int, optional): The lifetime of the cached content, in seconds.
+
+        Returns:
+            GeminiProcessor or None: A processor sharing this processor's cache and limiters whose
+                model implicitly starts every prompt with the prefix, or None if the prefix is below
+                the minimum cacheable size of the model. The processor's `cache_expires_at`
+                attribute tells when the cached content expires.
+        """
+        # Avoid a token counting call for prefixes obviously below the minimum size
+        if len(prefix) // CHARS_PER_TOKEN < GEMINI_CONTEXT_CACHE_MIN_TOKENS // 2:
+            return None
+        token_count = self.count_tokens(prefix)
+        if token_count < GEMINI_CONTEXT_CACHE_MIN_TOKENS:
+            logging.info(f"Prompt prefix of {token_count} tokens is too small for context caching.")
+            return None
+        cached_content = caching.CachedContent.create(
+            model_name=self.model_name,
+            contents=[prefix],
+            ttl=timedelta(seconds=ttl_seconds)
+        )
+        logging.info(f"Cached prompt prefix of {token_count} tokens as {cached_content.name}.")
+        processor = copy.copy(self)
+        processor.gemini_model = PreviewGenerativeModel.from_cached_content(cached_content=cached_content)
+        # Responses depend on the prefix, which is no longer part of the sent prompt
+        processor.model_name = f"{self.model_name}+{hashlib.sha256(prefix.encode('utf-8')).hexdigest()}"
+        processor.cache_expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
+        return processor
+
+    def count_tokens(self, text):
+        """
+        Counts the tokens of a text prompt with the model's tokenizer.
+
+        Args:
+            text (str): The text prompt.
+
+        Returns:
+            int: The number of tokens of the prompt.
+        """
+        return self.gemini_model.count_tokens([text]).total_tokens
+
+    def _get_cached(self, key, validate):
+        """
+        Returns the cached response of a key, or None on a miss. Cached responses rejected by
+        `validate` are ignored, so that they are regenerated and replaced.
+        """
+        cached_text = self.cache.get(key)
+        if cached_text is None:
+            return None
+        if validate is not None:
+            try:
+                validate(cached_text)
+            except ValueError as e:
+                logging.warning(f"Ignoring cached Gemini response rejected by validation: {e}")
+                return None
+        logging.info("Gemini response served from cache.")
+        return cached_text
+
+    def _set_cached(self, key, text, validate):
+        """
+        Caches a response once `validate` accepts it.
+
+        Raises:
+            ValueError: If `validate` rejects the response, which is then not cached.
+        """
+        if validate is not None:
+            validate(text)
+        self.cache.set(key, text)
+
+    def generate_content_from_text(self, text, generation_config=None, validate=None):
+        """
+        Generates content based on a provided text prompt, serving it from the cache when possible.
+
+        Args:
+            text (str): The text prompt for content generation.
+            generation_config (dict, optional): The generation config passed to the model.
+            validate (callable, optional): Raises ValueError for a response text that must not be
+                cached or served from the cache. Defaults to caching every response.
+
+        Returns:
+            str: The generated content (response text).
+
+        Raises:
+            ValueError: If `validate` rejects the generated response.
+        """
+        key = cache_key(self.model_name, text, generation_config)
+        if self.cache is not None:
+            cached_text = self._get_cached(key, validate)
+            if cached_text is not None:
+                return cached_text
+        response = self.gemini_model.generate_content([text], generation_config=generation_config)
+        self._log_usage(response)
+        if self.cache is not None:
+            self._set_cached(key, response.text, validate)
+        return response.text
 
-    def generate_content_from_text(self, text):
+    def generate_content_stream(self, text, generation_config=None, validate=None):
         """
-        Generates content based on a provided text prompt.
+        Generates content based on a provided text prompt, yielding the response text as it streams in.
+        A cached response is yielded as a single chunk. The response is only cached once fully received
+        and accepted by `validate`, so closing the generator early aborts the request without caching
+        a partial response.
 
         Args:
             text (str): The text prompt for content generation.
+            generation_config (dict, optional): The generation config passed to the model.
+            validate (callable, optional): Raises ValueError for a response text that must not be
+                cached or served from the cache. Defaults to caching every response.
+
+        Yields:
+            str: The next chunk of generated content.
+
+        Raises:
+            ValueError: If `validate` rejects the complete response.
+        """
+        key = cache_key(self.model_name, text, generation_config)
+        if self.cache is not None:
+            cached_text = self._get_cached(key, validate)
+            if cached_text is not None:
+                yield cached_text
+                return
+        responses = self.gemini_model.generate_content([text], generation_config=generation_config, stream=True)
+        chunks = []
+        try:
+            response = None
+            for response in responses:
+                # Chunks without text (e.g. the final one holding the finish reason) raise on `.text`
+                try:
+                    chunk = response.text
+                except ValueError:
+                    continue
+                chunks.append(chunk)
+                yield chunk
+        finally:
+            # Stop reading the stream when the consumer aborts early
+            close = getattr(responses, "close", None)
+            if close is not None:
+                close()
+        if response is not None:
+            self._log_usage(response)  # The last chunk carries the usage of the whole request
+        if self.cache is not None:
+            self._set_cached(key, "".join(chunks), validate)
+
+    async def _generate_with_retries(self, contents, generation_config, estimated_tokens):
+        """
+        Sends an async generation request once the rate limiters allow it, retrying with
+        exponential backoff and full jitter on retryable errors.
+
+        Args:
+            contents (list): The contents of the request.
+            generation_config (dict): The generation config passed to the model.
+            estimated_tokens (int): The estimated number of tokens of the request.
+
+        Returns:
+            GenerationResponse: The response returned by the model.
+
+        Raises:
+            Exception: The last error if the request is not retryable or every retry failed.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.request_limiter.acquire()
+            await self.token_limiter.acquire(estimated_tokens)
+            try:
+                response = await asyncio.wait_for(
+                    self.gemini_model.generate_content_async(contents, generation_config=generation_config),
+                    timeout=self.request_timeout
+                )
+            except Exception as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    raise
+                delay = random.uniform(0, min(RETRY_MAX_DELAY_SECONDS, RETRY_BASE_DELAY_SECONDS * 2 ** attempt))
+                logging.warning(f"Gemini request failed ({e!r}); retrying in {delay:.1f}s (attempt {attempt + 1}/{self.max_retries}).")
+                await asyncio.sleep(delay)
+                continue
+            # Reconcile the token estimate with the tokens actually used
+            usage = response.usage_metadata
+            self.token_limiter.adjust(usage.prompt_token_count + usage.candidates_token_count - estimated_tokens)
+            return response
+
+    async def generate_content_async(self, contents, generation_config=None, validate=None):
+        """
+        Generates content asynchronously from a text prompt or a list of contents, serving text-only
+        prompts from the cache when possible.
+
+        Args:
+            contents (str | list): The text prompt, or a list of text prompts and `Part` objects.
+            generation_config (dict, optional): The generation config passed to the model.
+            validate (callable, optional): Raises ValueError for a response text that must not be
+                cached or served from the cache. Defaults to caching every response.
 
         Returns:
             str: The generated content (response text).
+
+        Raises:
+            ValueError: If `validate` rejects the generated response.
         """
-        response = self.gemini_model.generate_content([text])
+        if isinstance(contents, str):
+            contents = [contents]
+        cacheable = self.cache is not None and all(isinstance(content, str) for content in contents)
+        if cacheable:
+            key = cache_key(self.model_name, contents[0] if len(contents) == 1 else contents, generation_config)
+            cached_text = self._get_cached(key, validate)
+            if cached_text is not None:
+                return cached_text
+        estimated_tokens = sum(len(content) for content in contents if isinstance(content, str)) // CHARS_PER_TOKEN + 1
+        async with self.concurrency_limiter:
+            response = await self._generate_with_retries(contents, generation_config, estimated_tokens)
+        self._log_usage(response)
+        if cacheable:
+            self._set_cached(key, response.text, validate)
         return response.text
 
     def generate_content_from_image(self, image_uri, question):
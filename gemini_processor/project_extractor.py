@@ -0,0 +1,391 @@
+from config.settings import GEMINI_CONTEXT_CACHE_ENABLED, GEMINI_LONG_DOCUMENT_TOKENS, GEMINI_CHUNK_TOKENS, GEMINI_MAX_CONCURRENT_REQUESTS
+from .chunked_extraction import chunk_markdown, merge_partial_projects
+from .derived_fields import derive_project_fields
+from .gemini_processor import GeminiProcessor
+from .prompt_preparer import PromptPreparer
+from .prompt_template import PrefixedPromptTemplate
+from .response_cache import get_default_response_cache
+from .response_parser import IncrementalJsonParser
+from models import Project
+from .templates.base_project_template import (
+    BASE_PROJECT_PREFIX_TEMPLATE,
+    BASE_PROJECT_SUFFIX_TEMPLATE,
+    BASE_PROJECT_CHUNK_PREFIX_TEMPLATE,
+    BASE_PROJECT_CHUNK_SUFFIX_TEMPLATE,
+)
+from .values.base_project_template_values import PROJECT_DERIVED_FIELDS, PROJECT_GENERATION_CONFIG, PROJECT_PARTIAL_GENERATION_CONFIG
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+import asyncio
+import functools
+import logging
+import threading
+
+CONTEXT_CACHE_RENEWAL_MARGIN = timedelta(minutes=5)  # Renew cached prefixes this long before they expire
+
+def build_project_prompt_template():
+    """
+    Builds the project prompt template, with its static instructions rendered once.
+
+    Returns:
+        PrefixedPromptTemplate: The project prompt template.
+    """
+    return PrefixedPromptTemplate(BASE_PROJECT_PREFIX_TEMPLATE, BASE_PROJECT_SUFFIX_TEMPLATE)
+
+def build_project_chunk_prompt_template():
+    """
+    Builds the prompt template of the parts of long readmes, with its static instructions rendered once.
+
+    Returns:
+        PrefixedPromptTemplate: The project chunk prompt template.
+    """
+    return PrefixedPromptTemplate(BASE_PROJECT_CHUNK_PREFIX_TEMPLATE, BASE_PROJECT_CHUNK_SUFFIX_TEMPLATE)
+
+def complete_project(data, derived_fields):
+    """
+    Completes generated project data with the fields derived from the readme.
+
+    Args:
+        data (dict): The generated project data.
+        derived_fields (dict): The fields returned by `derive_project_fields`.
+
+    Returns:
+        dict: The complete project data, in the field order of the `Project` model, with values
+            coerced to the types of the model.
+
+    Raises:
+        ModelValidationError: If the project is not valid against the `Project` model, listing
+            every invalid field.
+    """
+    return Project.parse({**data, **derived_fields}, ignore_unknown=False).to_dict()
+
+def decode_project_response(response, partial=False):
+    """
+    Decodes the JSON generated for a project prompt into a dictionary. The fields derived from
+    the readme are not part of the generated JSON.
+
+    Args:
+        response (str): The generated response text.
+        partial (bool, optional): Whether the project may leave out required fields, as extracted
+            from one part of a long readme.
+
+    Returns:
+        dict: The decoded project data.
+
+    Raises:
+        MalformedResponseError: If the response is not a valid JSON object matching the generated `Project` fields.
+    """
+    parser = IncrementalJsonParser(Project, partial=partial, exclude=PROJECT_DERIVED_FIELDS)
+    parser.feed(response)
+    return parser.close()
+
+class ProjectExtractor:
+    """
+    Extracts structured project data from project readmes with the Gemini AI model.
+
+    The extractor keeps no per-readme state: every call renders its own prompt and holds its own
+    image placeholders, so one instance can be shared by threads and asyncio tasks. Build it once
+    per process with `get_project_extractor` so that all extractions reuse one model client and
+    one response cache.
+
+    The static instructions of the prompt are rendered once. When context caching is enabled and
+    they are large enough to be cached, they are registered as Vertex AI cached content and each
+    request only sends the readme; otherwise the pre-rendered instructions are sent inline.
+
+    The id, read time and links are computed from the readme rather than generated.
+
+    Readmes longer than `long_document_tokens` are split at headings into chunks, whose partial
+    projects are extracted concurrently and merged by a deterministic reducer, so that no request
+    grows with the size of the document.
+
+    Attributes:
+        ai_manager (GeminiProcessor): The processor used to generate the responses.
+        prompt_preparer (PromptPreparer): Strips images from the readmes and enforces the token budget.
+        prompt_template (PrefixedPromptTemplate): The project prompt template.
+        context_cache (bool): Whether to register the static prompt prefix as cached content.
+        chunk_prompt_template (PrefixedPromptTemplate): The prompt template of the parts of long readmes.
+        long_document_tokens (int): The estimated size above which readmes are extracted in chunks.
+        chunk_tokens (int): The maximum estimated size of one readme chunk.
+    """
+
+    def __init__(self, ai_manager=None, prompt_template=None, context_cache=GEMINI_CONTEXT_CACHE_ENABLED,
+                 long_document_tokens=GEMINI_LONG_DOCUMENT_TOKENS, chunk_tokens=GEMINI_CHUNK_TOKENS):
+        """
+        Initializes the ProjectExtractor.
+
+        Args:
+            ai_manager (GeminiProcessor, optional): The processor used to generate the responses.
+                Defaults to a processor backed by the default response cache.
+            prompt_template (PrefixedPromptTemplate, optional): The project prompt template.
+            context_cache (bool, optional): Whether to register the static prompt prefix as cached content.
+            long_document_tokens (int, optional): The estimated size above which readmes are extracted in chunks.
+            chunk_tokens (int, optional): The maximum estimated size of one readme chunk.
+        """
+        self.ai_manager = ai_manager or GeminiProcessor(cache=get_default_response_cache())
+        self.prompt_preparer = PromptPreparer(token_counter=self.ai_manager.count_tokens)
+        self.prompt_template = prompt_template or build_project_prompt_template()
+        self.context_cache = context_cache
+        self.chunk_prompt_template = build_project_chunk_prompt_template()
+        self.long_document_tokens = long_document_tokens
+        self.chunk_tokens = chunk_tokens
+        self._prefix_processor = None
+        self._prefix_checked = False
+        self._prefix_lock = threading.Lock()
+
+    def render_prompt(self, input_readme):
+        """
+        Renders the project prompt of a readme, with its images replaced by placeholders.
+
+        Args:
+            input_readme (str): The project readme.
+
+        Returns:
+            tuple: A tuple containing:
+                - str: The rendered prompt.
+                - dict: The image placeholders to restore in the extracted project.
+        """
+        input_readme, placeholders = self.prompt_preparer.strip_images(input_readme)
+        return self.prompt_template.render(input_readme=input_readme), placeholders
+
+    def _cached_prefix_processor(self):
+        """
+        Returns the processor whose model holds the static prompt prefix as cached content, creating
+        or renewing the cached content when needed, or None if the prefix cannot be cached.
+        """
+        if not self.context_cache:
+            return None
+        with self._prefix_lock:
+            processor = self._prefix_processor
+            if processor is not None and processor.cache_expires_at - CONTEXT_CACHE_RENEWAL_MARGIN > datetime.now(timezone.utc):
+                return processor
+            if processor is None and self._prefix_checked:
+                return None
+            self._prefix_checked = True
+            try:
+                self._prefix_processor = self.ai_manager.with_cached_prefix(self.prompt_template.prefix)
+            except Exception as e:
+                logging.warning(f"Failed to cache the project prompt prefix, sending it inline: {e}")
+                self._prefix_processor = None
+            return self._prefix_processor
+
+    def _prepare_request(self, input_readme):
+        """
+        Prepares the request of a readme: the processor to send it to and the prompt to send.
+
+        Args:
+            input_readme (str): The project readme, with its images replaced by placeholders.
+
+        Returns:
+            tuple: A tuple containing:
+                - GeminiProcessor: The processor to send the prompt to.
+                - str: The prompt, without the prefix if the processor holds it as cached content.
+
+        Raises:
+            ValueError: If the full prompt exceeds the token budget.
+        """
+        suffix = self.prompt_template.render_suffix(input_readme=input_readme)
+        self.prompt_preparer.enforce_budget(self.prompt_template.prefix + suffix)
+        processor = self._cached_prefix_processor()
+        if processor is not None:
+            return processor, suffix
+        return self.ai_manager, self.prompt_template.prefix + suffix
+
+    def extract(self, input_readme, stream=True, project_id=None):
+        """
+        Extracts the project of a readme.
+
+        Args:
+            input_readme (str): The project readme.
+            stream (bool, optional): Whether to stream the response and validate it as it arrives,
+                aborting at the first malformed field. Defaults to True.
+            project_id (str, optional): The project id used when the readme has no stamped File Id,
+                e.g. the Drive file id.
+
+        Returns:
+            dict: A dictionary containing structured project data extracted from the AI response.
+
+        Raises:
+            ValueError: If the project has no stable id, if the prompt exceeds the token budget, or if
+                the response is not a valid JSON object matching the `Project` model.
+        """
+        derived_fields = derive_project_fields(input_readme, project_id)
+        input_readme, placeholders = self.prompt_preparer.strip_images(input_readme)
+        if self._is_long_document(input_readme):
+            data = self._extract_chunks(input_readme)
+        elif stream:
+            data = self._stream_project(*self._prepare_request(input_readme), derived_fields)
+        else:
+            processor, prompt = self._prepare_request(input_readme)
+            response = processor.generate_content_from_text(
+                prompt, generation_config=PROJECT_GENERATION_CONFIG, validate=project_response_validator(derived_fields)
+            )
+            data = decode_project_response(response)
+        return self.prompt_preparer.restore_images(complete_project(data, derived_fields), placeholders)
+
+    async def extract_async(self, input_readme, project_id=None):
+        """
+        Extracts the project of a readme without blocking the event loop. Requests go through the
+        rate limiters and retries of `GeminiProcessor.generate_content_async`.
+
+        Args:
+            input_readme (str): The project readme.
+            project_id (str, optional): The project id used when the readme has no stamped File Id,
+                e.g. the Drive file id.
+
+        Returns:
+            dict: A dictionary containing structured project data extracted from the AI response.
+
+        Raises:
+            ValueError: If the project has no stable id, if the prompt exceeds the token budget, or if
+                the response is not a valid JSON object matching the `Project` model.
+        """
+        derived_fields = derive_project_fields(input_readme, project_id)
+        input_readme, placeholders = self.prompt_preparer.strip_images(input_readme)
+        if self._is_long_document(input_readme):
+            data = await self._extract_chunks_async(input_readme)
+        else:
+            # Counting the tokens of large prompts and caching the prefix are blocking API calls
+            processor, prompt = await asyncio.to_thread(self._prepare_request, input_readme)
+            response = await processor.generate_content_async(
+                prompt, generation_config=PROJECT_GENERATION_CONFIG, validate=project_response_validator(derived_fields)
+            )
+            data = decode_project_response(response)
+        return self.prompt_preparer.restore_images(complete_project(data, derived_fields), placeholders)
+
+    def _is_long_document(self, input_readme):
+        """
+        Returns whether a readme is long enough to be extracted in chunks.
+        """
+        return self.prompt_preparer.estimate_tokens(input_readme) > self.long_document_tokens
+
+    def _chunk_prompts(self, input_readme):
+        """
+        Splits a long readme at headings into chunks and renders the prompt of every chunk.
+
+        Args:
+            input_readme (str): The project readme, with its images replaced by placeholders.
+
+        Returns:
+            list: The chunk prompts, in document order.
+
+        Raises:
+            ValueError: If a chunk prompt exceeds the token budget.
+        """
+        chunks = chunk_markdown(input_readme, self.chunk_tokens)
+        logging.info(f"Extracting a long readme in {len(chunks)} chunks.")
+        prompts = [
+            self.chunk_prompt_template.render(input_readme=chunk, part=index + 1, parts=len(chunks))
+            for index, chunk in enumerate(chunks)
+        ]
+        for prompt in prompts:
+            self.prompt_preparer.enforce_budget(prompt)
+        return prompts
+
+    def _extract_chunks(self, input_readme):
+        """
+        Extracts the project of a long readme: a partial project is extracted from every chunk
+        concurrently, and the partial projects are merged.
+
+        Sync callers run on worker threads without an event loop. The async model client is bound
+        to the first event loop using it, so the chunks are sent with the sync client on a thread
+        pool instead of on a new event loop per call.
+
+        Args:
+            input_readme (str): The project readme, with its images replaced by placeholders.
+
+        Returns:
+            dict: The merged generated project data.
+
+        Raises:
+            ValueError: If a chunk prompt exceeds the token budget, or if a partial response is not
+                valid against the `Project` model.
+        """
+        prompts = self._chunk_prompts(input_readme)
+        validate = project_response_validator(partial=True)
+
+        def generate(prompt):
+            return self.ai_manager.generate_content_from_text(
+                prompt, generation_config=PROJECT_PARTIAL_GENERATION_CONFIG, validate=validate
+            )
+
+        with ThreadPoolExecutor(max_workers=min(GEMINI_MAX_CONCURRENT_REQUESTS, len(prompts))) as executor:
+            responses = list(executor.map(generate, prompts))
+        return merge_partial_projects([decode_project_response(response, partial=True) for response in responses])
+
+    async def _extract_chunks_async(self, input_readme):
+        """
+        Extracts the project of a long readme without blocking the event loop, see `_extract_chunks`.
+
+        Args:
+            input_readme (str): The project readme, with its images replaced by placeholders.
+
+        Returns:
+            dict: The merged generated project data.
+
+        Raises:
+            ValueError: If a chunk prompt exceeds the token budget, or if a partial response is not
+                valid against the `Project` model.
+        """
+        prompts = self._chunk_prompts(input_readme)
+        validate = project_response_validator(partial=True)
+        responses = await asyncio.gather(*[
+            self.ai_manager.generate_content_async(prompt, generation_config=PROJECT_PARTIAL_GENERATION_CONFIG, validate=validate)
+            for prompt in prompts
+        ])
+        return merge_partial_projects([decode_project_response(response, partial=True) for response in responses])
+
+    def _stream_project(self, processor, prompt, derived_fields):
+        """
+        Streams the response to a project prompt through an incremental parser, so that malformed
+        output aborts the request as soon as it appears.
+
+        Args:
+            processor (GeminiProcessor): The processor to send the prompt to.
+            prompt (str): The rendered project prompt.
+            derived_fields (dict): The fields derived from the readme, used to validate the response before it is cached.
+
+        Returns:
+            dict: The parsed project data.
+
+        Raises:
+            MalformedResponseError: If the response is not a valid JSON object matching the generated `Project` fields.
+        """
+        parser = IncrementalJsonParser(Project, exclude=PROJECT_DERIVED_FIELDS)
+        chunks = processor.generate_content_stream(
+            prompt, generation_config=PROJECT_GENERATION_CONFIG, validate=project_response_validator(derived_fields)
+        )
+        try:
+            for chunk in chunks:
+                parser.feed(chunk)
+        finally:
+            chunks.close()
+        return parser.close()
+
+def project_response_validator(derived_fields=None, partial=False):
+    """
+    Builds the check a generated project response must pass to be cached, so that malformed
+    generations are never replayed from the response cache.
+
+    Args:
+        derived_fields (dict, optional): The fields derived from the readme, completing full projects.
+        partial (bool, optional): Whether the response is a partial project, extracted from one part
+            of a long readme.
+
+    Returns:
+        callable: The function raising ValueError for a response that is not a valid project.
+    """
+    def validate(response):
+        data = decode_project_response(response, partial=partial)
+        if not partial:
+            complete_project(data, derived_fields)
+    return validate
+
+@functools.cache
+def get_project_extractor():
+    """
+    Returns the process-wide project extractor.
+
+    Returns:
+        ProjectExtractor: The shared extractor.
+    """
+    return ProjectExtractor()
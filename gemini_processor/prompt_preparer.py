@@ -0,0 +1,126 @@
+from config.settings import GEMINI_PROMPT_TOKEN_BUDGET
+from .derived_fields import IMAGE_LABEL_PATTERN
+import logging
+import re
+
+# Matches the image references of a markdown document: inline base64 data URIs anywhere,
+# targets of reference-style definitions (`[image1]: <https://...>`) and inline images. Definitions
+# are only images when their label is used by an image reference, see `IMAGE_LABEL_PATTERN`.
+IMAGE_REFERENCE_PATTERN = re.compile(
+    r'(?P<data>data:image/[a-zA-Z0-9.+-]+;base64,[A-Za-z0-9+/=]+)'
+    r'|^\[(?P<label>[^\]\n]*)\]:[ \t]*<?(?P<definition>https?://[^\s>]+)'
+    r'|!\[[^\]\n]*\]\((?P<inline>https?://[^\s)]+)',
+    re.MULTILINE
+)
+PLACEHOLDER_PATTERN = re.compile(r'img://\d+')
+CHARS_PER_TOKEN = 4  # Average used to estimate token counts locally
+EXACT_COUNT_THRESHOLD = 0.8  # Fraction of the budget above which tokens are counted exactly
+
+class PromptPreparer:
+    """
+    Prepares text before it is sent to Gemini and post-processes the generated output.
+
+    Image references are replaced with short placeholders such as `img://1` so that base64 payloads
+    and long URLs do not cost prompt tokens, and are restored in the generated JSON afterwards.
+    Prompts are checked against a token budget before being sent.
+
+    Attributes:
+        token_budget (int): The maximum number of prompt tokens allowed per request.
+        token_counter (callable): Counts the tokens of a prompt exactly, e.g. `GeminiProcessor.count_tokens`.
+    """
+
+    def __init__(self, token_budget=GEMINI_PROMPT_TOKEN_BUDGET, token_counter=None):
+        """
+        Initializes the PromptPreparer.
+
+        Args:
+            token_budget (int, optional): The maximum number of prompt tokens allowed per request.
+            token_counter (callable, optional): Counts the tokens of a prompt exactly. Without it,
+                prompts are checked against the local estimate only.
+        """
+        self.token_budget = token_budget
+        self.token_counter = token_counter
+
+    def strip_images(self, text):
+        """
+        Replaces every image reference in the text with a short placeholder. Identical references
+        share one placeholder. Reference-style definitions of links, e.g. `[1]: <https://github.com/...>`,
+        are kept, since only the definitions used by `![...][label]` images are replaced.
+
+        Args:
+            text (str): The text to prepare, typically a markdown readme.
+
+        Returns:
+            tuple: A tuple containing:
+                - str: The text with placeholders in place of image references.
+                - dict: A dictionary mapping each placeholder to the reference it replaces.
+        """
+        placeholders = {}
+        references = {}
+        segments = []
+        position = 0
+        image_labels = {match.group("label").lower() for match in IMAGE_LABEL_PATTERN.finditer(text)}
+        for match in IMAGE_REFERENCE_PATTERN.finditer(text):
+            group = match.lastgroup
+            if group == "definition" and match.group("label").lower() not in image_labels:
+                continue
+            reference = match.group(group)
+            if reference not in references:
+                references[reference] = f"img://{len(references) + 1}"
+                placeholders[references[reference]] = reference
+            segments.append(text[position:match.start(group)])
+            segments.append(references[reference])
+            position = match.end(group)
+        segments.append(text[position:])
+        stripped_text = "".join(segments)
+        if placeholders:
+            logging.info(f"Replaced {len(placeholders)} image references, saving {len(text) - len(stripped_text)} characters.")
+        return stripped_text, placeholders
+
+    def restore_images(self, data, placeholders):
+        """
+        Restores the image references replaced by `strip_images` in generated data.
+
+        Args:
+            data (dict | list | str): The generated data, typically a JSON object decoded from the response.
+            placeholders (dict): The placeholders returned by `strip_images`.
+
+        Returns:
+            dict | list | str: The data with the original references in place of the placeholders.
+        """
+        if not placeholders:
+            return data
+        if isinstance(data, str):
+            return PLACEHOLDER_PATTERN.sub(lambda match: placeholders.get(match.group(0), match.group(0)), data)
+        if isinstance(data, dict):
+            return {key: self.restore_images(value, placeholders) for key, value in data.items()}
+        if isinstance(data, list):
+            return [self.restore_images(item, placeholders) for item in data]
+        return data
+
+    def estimate_tokens(self, prompt):
+        """
+        Estimates the number of tokens of a prompt without calling the API.
+        """
+        return len(prompt) // CHARS_PER_TOKEN + 1
+
+    def enforce_budget(self, prompt):
+        """
+        Checks a prompt against the token budget. The local estimate is used when it is comfortably
+        within the budget; otherwise the tokens are counted exactly with the token counter.
+
+        Args:
+            prompt (str): The rendered prompt.
+
+        Returns:
+            int: The estimated or counted number of prompt tokens.
+
+        Raises:
+            ValueError: If the prompt exceeds the token budget.
+        """
+        token_count = self.estimate_tokens(prompt)
+        if token_count > self.token_budget * EXACT_COUNT_THRESHOLD and self.token_counter is not None:
+            token_count = self.token_counter(prompt)
+        if token_count > self.token_budget:
+            raise ValueError(f"Prompt of {token_count} tokens exceeds the budget of {self.token_budget} tokens.")
+        return token_count
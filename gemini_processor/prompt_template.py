@@ -0,0 +1,54 @@
+import hashlib
+
+class PrefixedPromptTemplate:
+    """
+    A prompt made of a static prefix, rendered once, followed by a suffix rendered on every call.
+
+    Only the suffix depends on the per-call values (e.g. the readme), so rendering a prompt costs
+    one small template render and one string concatenation. Keeping the static part first also
+    lets it be registered once as Vertex AI cached content, see `GeminiProcessor.with_cached_prefix`.
+
+    Attributes:
+        prefix (str): The rendered static prefix.
+        prefix_hash (str): The SHA-256 hex digest of the prefix.
+        suffix_template (Template): The template of the per-call suffix.
+        values (dict): The values shared by every rendered suffix; never modified.
+    """
+
+    def __init__(self, prefix_template, suffix_template, values=None):
+        """
+        Renders the static prefix.
+
+        Args:
+            prefix_template (Template): The template of the static prefix, rendered once with `values`.
+            suffix_template (Template): The template of the per-call suffix.
+            values (dict, optional): The values shared by the prefix and every suffix.
+        """
+        self.values = values or {}
+        self.prefix = prefix_template.render(self.values)
+        self.prefix_hash = hashlib.sha256(self.prefix.encode("utf-8")).hexdigest()
+        self.suffix_template = suffix_template
+
+    def render_suffix(self, **values):
+        """
+        Renders the per-call suffix.
+
+        Args:
+            **values: The per-call values, e.g. `input_readme`.
+
+        Returns:
+            str: The rendered suffix.
+        """
+        return self.suffix_template.render({**self.values, **values})
+
+    def render(self, **values):
+        """
+        Renders the full prompt: the static prefix followed by the per-call suffix.
+
+        Args:
+            **values: The per-call values, e.g. `input_readme`.
+
+        Returns:
+            str: The rendered prompt.
+        """
+        return self.prefix + self.render_suffix(**values)
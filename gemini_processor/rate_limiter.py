@@ -0,0 +1,80 @@
+from config.settings import GEMINI_MAX_CONCURRENT_REQUESTS, GEMINI_REQUESTS_PER_MINUTE, GEMINI_TOKENS_PER_MINUTE
+import asyncio
+import threading
+import time
+
+class AsyncTokenBucket:
+    """
+    Token bucket rate limiter for asyncio code. The bucket holds up to `capacity` tokens and is
+    refilled continuously at `refill_per_second`; callers wait until enough tokens are available.
+
+    Async requests of a process must all run on one event loop: the async client of the shared
+    Gemini model is bound to the first loop using it. The lock only keeps the balance consistent
+    for `adjust` calls made from other threads.
+
+    Attributes:
+        capacity (float): The maximum number of tokens in the bucket.
+        refill_per_second (float): The number of tokens added to the bucket per second.
+    """
+
+    def __init__(self, capacity, refill_per_second):
+        """
+        Initializes a full bucket.
+
+        Args:
+            capacity (float): The maximum number of tokens in the bucket.
+            refill_per_second (float): The number of tokens added to the bucket per second.
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, limit):
+        """
+        Builds a bucket allowing `limit` tokens per minute, with bursts of up to one minute of quota.
+        """
+        return cls(capacity=limit, refill_per_second=limit / 60)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.refill_per_second)
+        self._updated_at = now
+
+    async def acquire(self, amount=1):
+        """
+        Waits until `amount` tokens are available and takes them. Requests larger than the
+        capacity wait for a full bucket.
+
+        Args:
+            amount (float, optional): The number of tokens to take. Defaults to 1.
+        """
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait_seconds = (amount - self._tokens) / self.refill_per_second
+            await asyncio.sleep(wait_seconds)
+
+    def adjust(self, amount):
+        """
+        Takes (or gives back, if negative) tokens without waiting, e.g. to reconcile an estimate
+        with the amount actually used. The balance may go negative, delaying later callers.
+
+        Args:
+            amount (float): The number of tokens to take.
+        """
+        with self._lock:
+            self._refill()
+            self._tokens = min(self.capacity, self._tokens - amount)
+
+# Quotas apply to the whole project, so every GeminiProcessor of the process shares these limiters by default
+default_request_limiter = AsyncTokenBucket.per_minute(GEMINI_REQUESTS_PER_MINUTE)
+default_token_limiter = AsyncTokenBucket.per_minute(GEMINI_TOKENS_PER_MINUTE)
+# Bound to the event loop of the async requests, like the async client of the shared Gemini model
+default_concurrency_limiter = asyncio.Semaphore(GEMINI_MAX_CONCURRENT_REQUESTS)
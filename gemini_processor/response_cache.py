@@ -0,0 +1,217 @@
+from config.auth import get_firestore_cloud_client
+from config.settings import GEMINI_CACHE_BACKEND, GEMINI_CACHE_MEMORY_SIZE, GEMINI_CACHE_TTL_SECONDS, GEMINI_CACHE_DIR, GEMINI_CACHE_COLLECTION
+from abc import ABC, abstractmethod
+from cachetools import LRUCache
+from datetime import datetime, timedelta, timezone
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+def cache_key(model_name, prompt, generation_config=None):
+    """
+    Builds the cache key of a generation call from everything that influences its output.
+
+    Args:
+        model_name (str): The name of the model.
+        prompt (str | list): The rendered prompt.
+        generation_config (dict, optional): The generation config of the call.
+
+    Returns:
+        str: The SHA-256 hex digest identifying the call.
+    """
+    payload = json.dumps(
+        {"model": model_name, "prompt": prompt, "generation_config": generation_config or {}},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class ResponseCache(ABC):
+    """
+    Base class of the caches storing generated responses by cache key, with hit and miss counters.
+    Subclasses implement `_get` and `_set`.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    @abstractmethod
+    def _get(self, key):
+        """
+        Returns the stored response for a key, or None.
+        """
+
+    @abstractmethod
+    def _set(self, key, value):
+        """
+        Stores a response under a key.
+        """
+
+    def get(self, key):
+        """
+        Returns the cached response for a key, or None on a miss.
+        """
+        value = self._get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """
+        Stores a response under a key.
+        """
+        self._set(key, value)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the cache.
+
+        Returns:
+            dict: The 'hits', 'misses' and 'hit_ratio' of the cache.
+        """
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {"hits": self.hits, "misses": self.misses, "hit_ratio": self.hits / lookups if lookups else 0.0}
+
+class MemoryResponseCache(ResponseCache):
+    """
+    In-process LRU cache of generated responses.
+    """
+
+    def __init__(self, maxsize=GEMINI_CACHE_MEMORY_SIZE):
+        super().__init__()
+        self._entries = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def _get(self, key):
+        with self._lock:
+            return self._entries.get(key)
+
+    def _set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+
+class DiskResponseCache(ResponseCache):
+    """
+    Local-disk cache of generated responses, one JSON file per key, with a time to live.
+    """
+
+    def __init__(self, directory=GEMINI_CACHE_DIR, ttl_seconds=GEMINI_CACHE_TTL_SECONDS):
+        super().__init__()
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _get(self, key):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry["created_at"] > self.ttl_seconds:
+            return None
+        return entry["response"]
+
+    def _set(self, key, value):
+        # Write to a temporary file first so that readers never see a partial entry
+        temp_path = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({"created_at": time.time(), "response": value}, file)
+        os.replace(temp_path, self._path(key))
+
+class FirestoreResponseCache(ResponseCache):
+    """
+    Firestore cache of generated responses, one document per key, with a time to live.
+    Expired entries are ignored on read; a Firestore TTL policy on the `expiresAt` field
+    can be configured to delete them.
+    """
+
+    def __init__(self, collection_name=GEMINI_CACHE_COLLECTION, ttl_seconds=GEMINI_CACHE_TTL_SECONDS, client=None):
+        super().__init__()
+        self.collection = (client or get_firestore_cloud_client()).collection(collection_name)
+        self.ttl_seconds = ttl_seconds
+
+    def _get(self, key):
+        try:
+            snapshot = self.collection.document(key).get()
+        except Exception as e:
+            logging.error(f"Error reading cached response '{key}': {e}")
+            return None
+        if not snapshot.exists:
+            return None
+        entry = snapshot.to_dict()
+        if entry["expiresAt"] <= datetime.now(timezone.utc):
+            return None
+        return entry["response"]
+
+    def _set(self, key, value):
+        try:
+            self.collection.document(key).set({
+                "response": value,
+                "expiresAt": datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+            })
+        except Exception as e:
+            logging.error(f"Error caching response '{key}': {e}")
+
+class TieredResponseCache(ResponseCache):
+    """
+    Chains several caches, from the fastest to the slowest. A hit in a slower tier is copied into
+    the faster tiers, and new responses are written to every tier.
+    """
+
+    def __init__(self, *tiers):
+        super().__init__()
+        self.tiers = tiers
+
+    def _get(self, key):
+        for index, tier in enumerate(self.tiers):
+            value = tier.get(key)
+            if value is not None:
+                for faster_tier in self.tiers[:index]:
+                    faster_tier.set(key, value)
+                return value
+        return None
+
+    def _set(self, key, value):
+        for tier in self.tiers:
+            tier.set(key, value)
+
+    def stats(self):
+        """
+        Returns the hit and miss counters of the whole cache and of every tier.
+        """
+        stats = super().stats()
+        stats["tiers"] = {type(tier).__name__: tier.stats() for tier in self.tiers}
+        return stats
+
+@functools.cache
+def get_default_response_cache():
+    """
+    Returns the process-wide response cache configured by `GEMINI_CACHE_BACKEND`: an in-memory
+    LRU tier, backed by a Firestore or local-disk tier when configured.
+
+    Returns:
+        ResponseCache or None: The shared cache, or None if caching is disabled.
+    """
+    if GEMINI_CACHE_BACKEND is None:
+        return None
+    memory_cache = MemoryResponseCache()
+    if GEMINI_CACHE_BACKEND == "memory":
+        return memory_cache
+    if GEMINI_CACHE_BACKEND == "disk":
+        return TieredResponseCache(memory_cache, DiskResponseCache())
+    if GEMINI_CACHE_BACKEND == "firestore":
+        return TieredResponseCache(memory_cache, FirestoreResponseCache())
+    raise ValueError(f"Unknown Gemini cache backend '{GEMINI_CACHE_BACKEND}'.")
@@ -0,0 +1,222 @@
+from models import Project, Model, ModelValidationError, decode_value
+import dataclasses
+import functools
+import json
+import typing
+
+WHITESPACE = " \t\r\n"
+PRIMITIVE_START = "-0123456789tfn"
+
+class MalformedResponseError(ValueError):
+    """
+    Raised when a generated response is not valid JSON or does not match the expected model.
+    """
+
+@functools.cache
+def _type_hints(model):
+    return typing.get_type_hints(model)
+
+def _required_fields(model):
+    return {
+        field.name for field in dataclasses.fields(model)
+        if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+    }
+
+def _to_json(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    return value
+
+def validate_value(value, annotation, path):
+    """
+    Checks that a decoded JSON value matches a model field annotation. Values are checked with the
+    same coercions as `Project.parse`, e.g. "8" is accepted for an integer, so the stream is only
+    aborted for values the final validation would reject.
+
+    Args:
+        value: The decoded JSON value.
+        annotation (type): The annotation of the field.
+        path (str): The path of the value, used in error messages.
+
+    Returns:
+        The value coerced to the annotation, as JSON data: e.g. 8 for "8", and dictionaries for
+        nested models, with their missing optional fields set to their default.
+
+    Raises:
+        MalformedResponseError: If the value does not match the annotation.
+    """
+    try:
+        return _to_json(decode_value(annotation, value, path, ignore_unknown=False))
+    except ModelValidationError as e:
+        raise MalformedResponseError(str(e)) from e
+
+class IncrementalJsonParser:
+    """
+    Parses a JSON object generated by Gemini as its text streams in, validating every top-level
+    field against a model dataclass as soon as the field is complete.
+
+    Unknown or duplicated keys, values of the wrong type and malformed JSON raise
+    `MalformedResponseError` from `feed`, so callers can abort a generation at the first bad
+    field instead of waiting for the full response.
+
+    Attributes:
+        model (type): The dataclass the object must match, `Project` by default.
+        partial (bool): Whether the object may leave out required top-level fields.
+        exclude (tuple): The top-level fields of the model that must not appear in the object.
+        fields (dict): The top-level fields parsed so far, coerced to the types of the model.
+    """
+
+    def __init__(self, model=Project, partial=False, exclude=()):
+        """
+        Initializes the parser.
+
+        Args:
+            model (type, optional): The dataclass the object must match.
+            partial (bool, optional): Whether the object may leave out required top-level fields,
+                e.g. when it is extracted from a part of a document only.
+            exclude (tuple, optional): The top-level fields of the model that must not appear in the
+                object, e.g. fields computed locally instead of generated.
+        """
+        self.model = model
+        self.partial = partial
+        self.exclude = exclude
+        self.fields = {}
+        self._hints = {key: hint for key, hint in _type_hints(model).items() if key not in exclude}
+        self._text = ""
+        self._position = 0
+        self._root_start = None
+        self._root_end = None
+        self._stack = []
+        self._state = "key"
+        self._in_string = False
+        self._escape = False
+        self._token_start = None
+        self._key = None
+        self._after_comma = False
+
+    def feed(self, chunk):
+        """
+        Parses the next chunk of the response.
+
+        Args:
+            chunk (str): The next chunk of generated text.
+
+        Raises:
+            MalformedResponseError: As soon as the text received so far cannot be a valid object of the model.
+        """
+        self._text += chunk
+        if self._root_start is None:
+            start = len(self._text) - len(self._text.lstrip(WHITESPACE))
+            if start == len(self._text):
+                return
+            if self._text[start] != "{":
+                raise MalformedResponseError("Response does not start with a JSON object.")
+            self._root_start = start
+            self._stack.append("{")
+            self._position = start + 1
+        while self._position < len(self._text) and self._root_end is None:
+            self._step(self._text[self._position])
+            self._position += 1
+        if self._root_end is not None and self._text[self._root_end:].strip(WHITESPACE):
+            raise MalformedResponseError("Unexpected text after the JSON object.")
+
+    def close(self):
+        """
+        Finishes parsing once the whole response has been fed.
+
+        Returns:
+            dict: The parsed object.
+
+        Raises:
+            MalformedResponseError: If the object is incomplete or misses required fields.
+        """
+        if self._root_end is None:
+            raise MalformedResponseError("Response ended before the JSON object was complete.")
+        missing = _required_fields(self.model) - set(self.exclude) - set(self.fields)
+        if missing and not self.partial:
+            raise MalformedResponseError(f"Missing fields {sorted(missing)} in the response.")
+        return self.fields
+
+    def _step(self, char):
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == '"':
+                self._in_string = False
+                if self._state == "key_string":
+                    self._accept_key(self._text[self._token_start:self._position + 1])
+                elif self._state == "value_string":
+                    self._accept_value(self._text[self._token_start:self._position + 1])
+            return
+        if len(self._stack) > 1:
+            # Inside a nested value: track strings and brackets until the value is complete
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                if self._stack.pop() != ("{" if char == "}" else "["):
+                    raise MalformedResponseError(f"Mismatched '{char}' in field '{self._key}'.")
+                if len(self._stack) == 1:
+                    self._accept_value(self._text[self._token_start:self._position + 1])
+            return
+        if self._state == "primitive":
+            if char not in WHITESPACE + ",}":
+                return
+            self._accept_value(self._text[self._token_start:self._position])
+        if char in WHITESPACE:
+            return
+        if self._state == "key":
+            if char == '"':
+                self._in_string, self._state, self._token_start = True, "key_string", self._position
+            elif char == "}" and not self._after_comma:
+                self._close_root()
+            else:
+                raise MalformedResponseError(f"Expected a field name at position {self._position}.")
+        elif self._state == "colon":
+            if char != ":":
+                raise MalformedResponseError(f"Expected ':' after field '{self._key}'.")
+            self._state = "value"
+        elif self._state == "value":
+            self._token_start = self._position
+            if char == '"':
+                self._in_string, self._state = True, "value_string"
+            elif char in "{[":
+                self._stack.append(char)
+                self._state = "nested"
+            elif char in PRIMITIVE_START:
+                self._state = "primitive"
+            else:
+                raise MalformedResponseError(f"Expected a value for field '{self._key}'.")
+        elif self._state == "comma":
+            if char == ",":
+                self._state, self._after_comma = "key", True
+            elif char == "}":
+                self._close_root()
+            else:
+                raise MalformedResponseError(f"Expected ',' or '}}' after field '{self._key}'.")
+
+    def _accept_key(self, token):
+        key = json.loads(token)
+        if key not in self._hints:
+            raise MalformedResponseError(f"Unexpected field '{key}' in the response.")
+        if key in self.fields:
+            raise MalformedResponseError(f"Duplicated field '{key}' in the response.")
+        self._key, self._state, self._after_comma = key, "colon", False
+
+    def _accept_value(self, token):
+        try:
+            value = json.loads(token)
+        except json.JSONDecodeError as e:
+            raise MalformedResponseError(f"Invalid JSON in field '{self._key}': {e}") from e
+        # Later steps, such as merging partial projects, rely on the coerced types
+        self.fields[self._key] = validate_value(value, self._hints[self._key], self._key)
+        self._state = "comma"
+
+    def _close_root(self):
+        self._stack.pop()
+        self._root_end = self._position + 1
@@ -1,30 +1,45 @@
 from jinja2 import Template
 
-BASE_PROJECT_TEMPLATE = Template(
+# Static instructions, identical for every project: rendered once and sent (or cached) as the prompt prefix
+BASE_PROJECT_PREFIX = """
+The readme at the end of this prompt is a project's design documentation. Analyze it and extract important project information in the JSON format of the response schema.
+
+**Instructions:**
+1. Based on the project description, determine appropriate values for each field of the schema.
+2. Associate images where needed and be creative figuring out each section.
+3. Don't drop any JSON field and make every part unique but technical.
+
+**Guidelines:**
+* Extract only the most relevant information.
+* Be concise but don't remove any technical details.
 """
-The following readme is a project's design documentation. Analyze it and extract important project information in the expected json format:
 
+# Per-project part of the prompt, kept last so that the prefix can be reused
+BASE_PROJECT_SUFFIX = """
 **Project Description:**
 {{ input_readme }}
+"""
 
-**Expected Format:**
-{{ expected_response_format }}
+# Prompt of one part of a long readme, whose partial projects are merged afterwards
+BASE_PROJECT_CHUNK_PREFIX = """
+The readme part at the end of this prompt is an excerpt of a project's design documentation, which is too long to be analyzed at once. Analyze this part only and extract the project information it contains in the JSON format of the response schema.
 
 **Instructions:**
-1. Based on the project description, determine appropriate values for each field in JSON format.
-2. Associate images where needed and be creative figuring out each section.
-2. Provide the extracted information in the JSON format as shown in the example.
-4. Don't drop any JSON field and make every part unique but technical.
-
-**Example Project Description:**
-{{ example_readme }}
-
-**Expected JSON Format:**
-{{ example_output }} 
+1. Only fill the fields this part provides information for, and leave the other fields out.
+2. Associate images where needed.
+3. Make every part unique but technical, and don't invent information missing from this part.
 
 **Guidelines:**
 * Extract only the most relevant information.
-* Ensure the output is in the correct JSON format.
 * Be concise but don't remove any technical details.
 """
-)
\ No newline at end of file
+
+BASE_PROJECT_CHUNK_SUFFIX = """
+**Project Description (part {{ part }} of {{ parts }}):**
+{{ input_readme }}
+"""
+
+BASE_PROJECT_PREFIX_TEMPLATE = Template(BASE_PROJECT_PREFIX)
+BASE_PROJECT_SUFFIX_TEMPLATE = Template(BASE_PROJECT_SUFFIX)
+BASE_PROJECT_CHUNK_PREFIX_TEMPLATE = Template(BASE_PROJECT_CHUNK_PREFIX)
+BASE_PROJECT_CHUNK_SUFFIX_TEMPLATE = Template(BASE_PROJECT_CHUNK_SUFFIX)
@@ -1,40 +1,22 @@
-from utils.samples.sample_project_template_values import *
+from models import Project, dataclass_schema
+from utils.samples.sample_project_template_values import input_readme
 
-EXPECTED_RESPONSE_FORMAT = """{
-    "id": "str",
-    "projectHeroImg": "str",
-    "projectTitle": "str",
-    "readTimeInMins": "int",
-    "overview": {
-        "textContents": [
-            {
-                "content": "str",
-                "imgUrl": "str"
-            }
-        ]
-    },
-    "problemStatement": "str",
-    "features": {
-        "textContents": [
-            {
-                "content": "str",
-                "imgUrl": "str"
-            }
-        ]
-    },
-    "demo": {
-        "title": "str",
-        "imgUrl": "str",
-        "videoUrl": "str",
-        "genres": ["List[str]"]
-    },
-    "relevantLinks": ["List[str]"],
-    "author": "Optional[str]"
-}"""
+# Project fields computed from the readme instead of generated, see `derived_fields`
+PROJECT_DERIVED_FIELDS = ("id", "readTimeInMins", "relevantLinks")
+
+# The response format is enforced by Gemini's structured output, from a schema generated from the models
+PROJECT_RESPONSE_SCHEMA = dataclass_schema(Project, exclude=PROJECT_DERIVED_FIELDS)
+PROJECT_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": PROJECT_RESPONSE_SCHEMA,
+}
+
+# Parts of long readmes may leave out any top-level field
+PROJECT_PARTIAL_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "response_schema": {**PROJECT_RESPONSE_SCHEMA, "required": []},
+}
 
 BASE_PROJECT_TEMPLATE_VALUES = {
     "input_readme": input_readme, # Contains the processed README input content
-    "expected_response_format": EXPECTED_RESPONSE_FORMAT, # Contains the expected project response definition
-    "example_readme": example_readme, # Contains an example readme for reference
-    "example_output": example_output, # Contains an example output for reference
 }
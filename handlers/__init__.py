@@ -1,6 +1,7 @@
 from .drive_handler.content_manager import DriveContentManager
 from .drive_handler.notification_handler import DriveNotificationHandler
+from .drive_handler.ingestion_pipeline import ProjectIngestionPipeline, PipelineReport
 from .github_handler.content_manager import GithubContentManager
 from .github_handler.notification_handler import GithubNotificationHandler
 
-__all__ = ["DriveContentManager", "DriveNotificationHandler", "GithubContentManager", "GithubNotificationHandler"]
\ No newline at end of file
+__all__ = ["DriveContentManager", "DriveNotificationHandler", "ProjectIngestionPipeline", "PipelineReport", "GithubContentManager", "GithubNotificationHandler"]
\ No newline at end of file
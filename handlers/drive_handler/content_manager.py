@@ -1,7 +1,21 @@
-from config.auth import get_google_drive_service, get_google_docs_service
+from config.auth import get_google_drive_service, get_google_docs_service, get_authorized_http
 from utils.file_handler import FileHandler
 from googleapiclient.errors import HttpError
-import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+import mimetypes
+import threading
+
+LIST_PAGE_SIZE = 1000  # Maximum page size accepted by files.list and changes.list
+SYNC_STATE_DOCUMENT = "DriveSyncState"  # Firestore document holding the Drive sync state
+START_PAGE_TOKEN_FIELD = "startPageToken"
+FOLDER_INDEX_FIELD = "folderIndex"  # The folder index as of the stored start page token
+FILE_FIELDS = "id, name, modifiedTime, md5Checksum, version"  # File metadata kept in the folder index
+BATCH_REQUEST_LIMIT = 100  # Maximum number of calls accepted in one batch HTTP request
+EXPORT_CONCURRENCY = 8  # Number of exports running at the same time in export_many
+DOCX_MIME_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+# File extensions of the Google Docs export formats, for the formats mimetypes does not know
+EXPORT_EXTENSIONS = {DOCX_MIME_TYPE: "docx", "text/markdown": "md", "text/plain": "txt", "application/pdf": "pdf"}
+CHANGE_FIELDS = f"nextPageToken, newStartPageToken, changes(fileId, removed, file({FILE_FIELDS}, parents, trashed))"
 
 class DriveContentManager:
     """
@@ -12,24 +26,80 @@ class DriveContentManager:
     Attributes:
         drive_service (Google Drive API service): The authenticated Google Drive service.
         folder_ids (dict): A dictionary mapping folder names to their corresponding Google Drive folder IDs.
-        content_identifiers (dict): A dictionary mapping folder names to lists of files within those folders.
+        sync_state_store (FirestoreManager): The store persisting the Drive changes start page token and the
+            folder index, if any.
+        content_identifiers (dict): A dictionary mapping folder names to the metadata of the files within those folders,
+            keyed by file name. It is the source of truth for file ID lookups.
         file_handler (FileHandler): An instance of the FileHandler class for handling file operations.
     """
     
-    def __init__(self, folder_ids):
+    def __init__(self, folder_ids, sync_state_store=None, drive_service=None, docs_service=None):
         """
         Initializes the DriveContentManager with an authenticated Drive service and a dictionary 
         of folder names and their corresponding Google Drive folder IDs.
 
         Args:
             folder_ids (dict): A dictionary mapping folder names to their corresponding Google Drive folder IDs.
+            sync_state_store (FirestoreManager, optional): Store used to persist the Drive changes start page token
+                and the folder index. Enables incremental syncing through `sync_changes` when provided, and
+                restoring the index from the store instead of listing every folder on start-up.
+            drive_service (optional): A Google Drive API service to use instead of the shared one.
+            docs_service (optional): A Google Docs API service to use instead of the shared one.
         """
-        self.drive_service = get_google_drive_service()
-        self.docs_service = get_google_docs_service()
+        self.drive_service = drive_service or get_google_drive_service()
+        self.docs_service = docs_service or get_google_docs_service()
         self.folder_ids = folder_ids
+        self.sync_state_store = sync_state_store
         self.content_identifiers = {}
+        self._file_locations = {}  # Maps file IDs to their (folder name, file name) in the index
+        self._thread_local = threading.local()  # Holds one HTTP transport per exporting thread
         self.file_handler = FileHandler()
-        self._refresh_content_identifier()
+        if not self._restore_content_identifier():
+            self._refresh_content_identifier()
+
+    def _index_files(self, content_identifiers):
+        """
+        Replaces the folder index, and the file locations derived from it.
+
+        Args:
+            content_identifiers (dict): A dictionary mapping folder names to their files, keyed by file name.
+        """
+        self.content_identifiers = content_identifiers
+        self._file_locations = {
+            file_metadata['id']: (folder_name, file_name)
+            for folder_name, folder_files in content_identifiers.items()
+            for file_name, file_metadata in folder_files.items()
+        }
+
+    def _unindex_file(self, file_id, location):
+        """
+        Drops a file from the folder index, unless its entry now belongs to another file of the same name.
+
+        Args:
+            file_id (str): The ID of the file.
+            location (tuple): The (folder name, file name) the file was indexed at.
+        """
+        folder_name, file_name = location
+        folder_files = self.content_identifiers.get(folder_name, {})
+        if folder_files.get(file_name, {}).get('id') == file_id:
+            del folder_files[file_name]
+
+    def _restore_content_identifier(self):
+        """
+        Restores the folder index persisted with the start page token, so that start-up does not
+        list every folder. `sync_changes` then brings the index up to date.
+
+        Returns:
+            bool: True if the index was restored, False if it has to be listed: incremental syncing is
+                disabled, it has never run, or the monitored folders changed since the index was stored.
+        """
+        if self.sync_state_store is None or self._load_start_page_token() is None:
+            return False
+        content_identifiers = self.sync_state_store.read_field(SYNC_STATE_DOCUMENT, FOLDER_INDEX_FIELD)
+        if not isinstance(content_identifiers, dict) or set(content_identifiers) != set(self.folder_ids):
+            return False
+        self._index_files(content_identifiers)
+        return True
 
     def _refresh_content_identifier(self):
         """
@@ -37,27 +107,183 @@ class DriveContentManager:
 
         This function fetches all the files present in the specified folders and
         stores them in the `content_identifiers` attribute for easy access later.
+        When incremental syncing is enabled, the index is persisted, and when no start
+        page token is stored yet, the token is taken before listing so that no change is missed.
         """
-        for folder_name, folder_id in self.folder_ids.items():
-            self.content_identifiers[folder_name] = self.get_files_in_folder(folder_id)
+        start_page_token = None
+        if self.sync_state_store is not None and self._load_start_page_token() is None:
+            start_page_token = self._fetch_start_page_token()
+        self._index_files({
+            folder_name: self.get_files_in_folder(folder_id) for folder_name, folder_id in self.folder_ids.items()
+        })
+        if self.sync_state_store is not None:
+            self._save_sync_state(start_page_token)
         print(self.content_identifiers)
 
     def get_files_in_folder(self, folder_id):
         """
-        Retrieves a dictionary of files inside a specific Google Drive folder using its ID.
-        The dictionary will have file IDs as keys and file names as values.
+        Retrieves a dictionary of files inside a specific Google Drive folder using its ID,
+        following `nextPageToken` until every page has been read.
 
         Args:
             folder_id (str): The ID of the Google Drive folder.
 
         Returns:
-            dict: A dictionary where the key is the file name and the value is the file id.
+            dict: A dictionary where the key is the file name and the value is the file metadata
+                ('id', 'modifiedTime', 'md5Checksum' and 'version').
         """
         query = f"'{folder_id}' in parents and trashed = false"
-        results = self.drive_service.files().list(q=query, fields="files(id, name)").execute()
-        files = results.get('files', [])
-        # Convert list of files into a dictionary with id as key and name as value
-        return {file['name']: file['id'] for file in files}
+        files = {}
+        page_token = None
+        while True:
+            results = self.drive_service.files().list(
+                q=query,
+                fields=f"nextPageToken, files({FILE_FIELDS})",
+                pageSize=LIST_PAGE_SIZE,
+                pageToken=page_token
+            ).execute()
+            # Map file names to their metadata
+            for file in results.get('files', []):
+                files[file['name']] = self._file_metadata(file)
+            page_token = results.get('nextPageToken')
+            if not page_token:
+                return files
+
+    def _file_metadata(self, file):
+        """
+        Extracts the metadata kept in the folder index from a Drive file resource.
+
+        Args:
+            file (dict): A file resource returned by the Drive API.
+
+        Returns:
+            dict: The file's 'id', 'modifiedTime', 'md5Checksum' and 'version'. Native Google Docs have no
+                'md5Checksum', so 'version' is the field to compare when detecting content changes.
+        """
+        return {
+            "id": file['id'],
+            "modifiedTime": file.get('modifiedTime'),
+            "md5Checksum": file.get('md5Checksum'),
+            "version": file.get('version'),
+        }
+
+    def _load_start_page_token(self):
+        """
+        Reads the persisted Drive changes start page token.
+
+        Returns:
+            str or None: The stored token, or None if incremental syncing has never run.
+        """
+        return self.sync_state_store.read_field(SYNC_STATE_DOCUMENT, START_PAGE_TOKEN_FIELD)
+
+    def _save_sync_state(self, page_token=None):
+        """
+        Persists the folder index, and the Drive changes start page token it is current as of, in one write.
+
+        Args:
+            page_token (str, optional): The token to persist. The stored token is kept when omitted.
+        """
+        sync_state = {FOLDER_INDEX_FIELD: self.content_identifiers}
+        if page_token is not None:
+            sync_state[START_PAGE_TOKEN_FIELD] = page_token
+        self.sync_state_store.update_document(SYNC_STATE_DOCUMENT, sync_state)
+
+    def _fetch_start_page_token(self):
+        """
+        Fetches the current start page token from the Drive changes API.
+
+        Returns:
+            str: A token pointing at the latest change.
+        """
+        return self.drive_service.changes().getStartPageToken().execute()['startPageToken']
+
+    def _monitored_folder_name(self, parents):
+        """
+        Finds the monitored folder a file belongs to.
+
+        Args:
+            parents (list): The parent folder IDs of the file.
+
+        Returns:
+            str or None: The name of the monitored folder, or None if the file is outside every monitored folder.
+        """
+        for folder_name, folder_id in self.folder_ids.items():
+            if folder_id in parents:
+                return folder_name
+        return None
+
+    def _apply_change(self, change):
+        """
+        Applies a single Drive change to the in-memory folder index.
+
+        Args:
+            change (dict): A change resource returned by `changes.list`.
+
+        Returns:
+            dict or None: A dictionary with the 'action' ('added', 'modified' or 'removed'), 'folder_name',
+                'file_name' and 'file_id' of the change, or None if it does not affect a monitored folder.
+        """
+        file_id = change.get('fileId')
+        file = change.get('file') or {}
+        previous_location = self._file_locations.pop(file_id, None)
+        if previous_location is not None:
+            previous_folder, previous_name = previous_location
+            self._unindex_file(file_id, previous_location)
+        folder_name = self._monitored_folder_name(file.get('parents', []))
+        if change.get('removed') or file.get('trashed') or folder_name is None:
+            # Trashed, deleted or moved out of the monitored folders
+            if previous_location is None:
+                return None
+            return {"action": "removed", "folder_name": previous_folder, "file_name": previous_name, "file_id": file_id}
+        self.content_identifiers[folder_name][file['name']] = self._file_metadata(file)
+        self._file_locations[file_id] = (folder_name, file['name'])
+        return {
+            "action": "modified" if previous_location is not None else "added",
+            "folder_name": folder_name,
+            "file_name": file['name'],
+            "file_id": file_id
+        }
+
+    def sync_changes(self):
+        """
+        Incrementally updates the folder index with the documents added, modified or trashed
+        since the last sync, using the Drive changes API and the persisted start page token.
+
+        The cost of a sync scales with the number of changes rather than with the size of the
+        monitored folders. The new start page token is persisted with the updated index once every
+        page of changes has been applied.
+
+        Returns:
+            list: One dictionary per change affecting a monitored folder, as returned by `_apply_change`.
+
+        Raises:
+            RuntimeError: If the manager was created without a sync state store.
+        """
+        if self.sync_state_store is None:
+            raise RuntimeError("Incremental syncing requires a sync state store.")
+        page_token = self._load_start_page_token()
+        if page_token is None:
+            # No baseline yet, so fall back to a full listing which also stores the token
+            self._refresh_content_identifier()
+            return []
+        applied_changes = []
+        while page_token:
+            response = self.drive_service.changes().list(
+                pageToken=page_token,
+                spaces="drive",
+                includeRemoved=True,
+                pageSize=LIST_PAGE_SIZE,
+                fields=CHANGE_FIELDS
+            ).execute()
+            for change in response.get('changes', []):
+                applied_change = self._apply_change(change)
+                if applied_change is not None:
+                    applied_changes.append(applied_change)
+            if 'newStartPageToken' in response:
+                self._save_sync_state(response['newStartPageToken'])
+            page_token = response.get('nextPageToken')
+        print(f"Applied {len(applied_changes)} Drive changes to the folder index.")
+        return applied_changes
 
     def get_file_from_folder(self, folder_id, file_name):
         """
@@ -68,15 +294,16 @@ class DriveContentManager:
             file_name (str): The name of the Google Docs file to retrieve.
 
         Returns:
-            dict or None: A dictionary containing the file's 'id' and 'name' if found, or None if not found.
+            dict or None: The file resource with its 'name' and the metadata fields kept in the
+                folder index if found, or None if not found.
         """
         try:
-            # URL encode the file name to handle special characters like spaces or punctuation
-            encoded_file_name = urllib.parse.quote(file_name)
+            # Escape backslashes and single quotes, the only characters with a meaning inside a query string literal
+            escaped_file_name = file_name.replace("\\", "\\\\").replace("'", "\\'")
             # Construct the query string
-            query = f"'{folder_id}' in parents and name = '{encoded_file_name}' and trashed = false and mimeType = 'application/vnd.google-apps.document'"
+            query = f"'{folder_id}' in parents and name = '{escaped_file_name}' and trashed = false and mimeType = 'application/vnd.google-apps.document'"
             # Execute the query
-            results = self.drive_service.files().list(q=query, fields="files(id, name)").execute()
+            results = self.drive_service.files().list(q=query, fields=f"files({FILE_FIELDS})").execute()
             files = results.get('files', [])
             # Handle the case of no files found
             if not files:
@@ -91,7 +318,233 @@ class DriveContentManager:
             print(f"Error retrieving file: {error}")
             return None
 
-    def read_google_docs(self, folder_name, file_name, output_file_name="output.docx", export_format="application/vnd.openxmlformats-officedocument.wordprocessingml.document"):
+    def get_file_metadata(self, folder_name, file_name):
+        """
+        Looks up the metadata of a file in the folder index, falling back to the Drive API only
+        on a cache miss. Files found through the fallback are added to the index.
+
+        Args:
+            folder_name (str): The name of the folder containing the file.
+            file_name (str): The name of the file.
+
+        Returns:
+            dict or None: The file metadata ('id', 'modifiedTime', 'md5Checksum' and 'version'),
+                or None if the folder is not monitored or the file does not exist.
+        """
+        if folder_name not in self.folder_ids:
+            return None
+        folder_files = self.content_identifiers.setdefault(folder_name, {})
+        if file_name in folder_files:
+            return folder_files[file_name]
+        file = self.get_file_from_folder(self.folder_ids[folder_name], file_name)
+        if file is None:
+            return None
+        folder_files[file_name] = self._file_metadata(file)
+        self._file_locations[file['id']] = (folder_name, file_name)
+        return folder_files[file_name]
+
+    def _forget_file(self, file_id):
+        """
+        Removes a file from the folder index.
+
+        Args:
+            file_id (str): The ID of the file to remove.
+        """
+        location = self._file_locations.pop(file_id, None)
+        if location is not None:
+            self._unindex_file(file_id, location)
+
+    def _export_extension(self, export_format):
+        """
+        Returns the file extension of an export MIME type, e.g. 'docx' or 'md', without the dot.
+        """
+        extension = EXPORT_EXTENSIONS.get(export_format) or mimetypes.guess_extension(export_format)
+        return extension.lstrip(".") if extension else "bin"
+
+    def _uuid_stamp_request(self, file_id, uuid):
+        """
+        Builds the Google Docs API request inserting a UUID at the start of a document.
+
+        Args:
+            file_id (str): The ID of the Google Docs file.
+            uuid (str): The UUID to insert.
+
+        Returns:
+            HttpRequest: The unexecuted `documents.batchUpdate` request.
+        """
+        return self.docs_service.documents().batchUpdate(
+            documentId=file_id,
+            body={
+                "requests": [
+                    {
+                        "insertText": {
+                            "location": {
+                                "index": 1  # Assuming index 1 is the start of the document
+                            },
+                            "text": f"File Id: \"{uuid}\"\n"
+                        }
+                    }
+                ]
+            }
+        )
+
+    def _execute_batch(self, service, requests):
+        """
+        Executes API calls grouped into batch HTTP requests of at most `BATCH_REQUEST_LIMIT` calls.
+
+        Each call gets its own result through the batch callback, so a failing call does not
+        affect the others. If a whole batch fails, every call in it is reported as failed.
+
+        Args:
+            service: The API service the calls belong to.
+            requests (dict): A dictionary mapping caller-chosen keys to unexecuted `HttpRequest` objects.
+
+        Returns:
+            tuple: A tuple containing:
+                - dict: The responses of the successful calls, keyed like `requests`.
+                - dict: The exceptions of the failed calls, keyed like `requests`.
+        """
+        responses, errors = {}, {}
+        keys = list(requests)
+
+        def callback(request_id, response, exception):
+            key = keys[int(request_id)]
+            if exception is not None:
+                errors[key] = exception
+            else:
+                responses[key] = response
+
+        for start in range(0, len(keys), BATCH_REQUEST_LIMIT):
+            chunk = range(start, min(start + BATCH_REQUEST_LIMIT, len(keys)))
+            batch = service.new_batch_http_request(callback=callback)
+            for index in chunk:
+                batch.add(requests[keys[index]], request_id=str(index))
+            try:
+                batch.execute()
+            except HttpError as error:
+                for index in chunk:
+                    errors.setdefault(keys[index], error)
+        return responses, errors
+
+    def _thread_http(self):
+        """
+        Returns the HTTP transport of the calling thread, creating it on first use.
+        """
+        http = getattr(self._thread_local, "http", None)
+        if http is None:
+            http = self._thread_local.http = get_authorized_http()
+        return http
+
+    def export_file(self, file_id, export_format="text/markdown"):
+        """
+        Exports a Google Docs file using the HTTP transport of the calling thread, so that it
+        can be called from several threads at the same time.
+
+        Args:
+            file_id (str): The ID of the Google Docs file.
+            export_format (str, optional): The MIME type to export the file in. Defaults to "text/markdown".
+
+        Returns:
+            bytes: The exported file content.
+
+        Raises:
+            HttpError: If the export request fails.
+        """
+        request = self.drive_service.files().export_media(fileId=file_id, mimeType=export_format)
+        return request.execute(http=self._thread_http())
+
+    def export_many(self, folder_name, file_names, export_format="text/markdown", max_workers=EXPORT_CONCURRENCY):
+        """
+        Exports several Google Docs files from a folder at once.
+
+        Drive does not accept media downloads inside batch HTTP requests, so the exports run
+        concurrently on a bounded thread pool instead, each thread using its own HTTP transport.
+        A failing export does not affect the others.
+
+        Args:
+            folder_name (str): The name of the folder containing the files.
+            file_names (list): The names of the Google Docs files to export.
+            export_format (str, optional): The MIME type to export the files in. Defaults to "text/markdown".
+            max_workers (int, optional): The maximum number of exports running at the same time.
+
+        Returns:
+            dict: A dictionary mapping each file name to its exported content in bytes, or None if the export failed.
+        """
+        def export(file_name):
+            try:
+                return self.export_file(file_ids[file_name], export_format)
+            except Exception as e:
+                print(f"Error exporting '{file_name}' to {export_format} format: {e}")
+                return None
+
+        # Resolve the file IDs up front, since index misses fall back to the shared Drive service
+        results, file_ids = {}, {}
+        for file_name in file_names:
+            file_metadata = self.get_file_metadata(folder_name, file_name)
+            if file_metadata is None:
+                print(f"No such file or folder found: {folder_name}/{file_name}.")
+                results[file_name] = None
+            else:
+                file_ids[file_name] = file_metadata['id']
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results.update(zip(file_ids, executor.map(export, file_ids)))
+        return results
+
+    def stamp_uuids(self, file_uuids):
+        """
+        Inserts UUIDs into several Google Docs files using batched `documents.batchUpdate` calls.
+
+        Args:
+            file_uuids (dict): A dictionary mapping Google Docs file IDs to the UUID to insert.
+
+        Returns:
+            dict: A dictionary mapping each file ID to True if its UUID was inserted, False otherwise.
+        """
+        requests = {file_id: self._uuid_stamp_request(file_id, uuid) for file_id, uuid in file_uuids.items()}
+        _, errors = self._execute_batch(self.docs_service, requests)
+        for file_id, error in errors.items():
+            print(f"Error adding UUID to file {file_id}: {error}")
+        return {file_id: file_id not in errors for file_id in file_uuids}
+
+    def read_many_google_docs(self, folder_name, file_names, export_format=DOCX_MIME_TYPE):
+        """
+        Exports several Google Docs files from a folder, adds a UUID to those missing one, and saves them locally.
+
+        This is the multi-document counterpart of `read_google_docs`: the exports run concurrently
+        through `export_many` and the new UUIDs are synced back in batched requests through `stamp_uuids`.
+
+        Args:
+            folder_name (str): The name of the folder containing the Google Docs files.
+            file_names (list): The names of the Google Docs files to retrieve.
+            export_format (str, optional): The MIME type to export the files in. Defaults to .docx.
+
+        Returns:
+            dict: A dictionary mapping each file name to a (local path, UUID) tuple, or None if the file could not be processed.
+        """
+        results = {}
+        new_uuids = {}
+        for file_name, file_content in self.export_many(folder_name, file_names, export_format).items():
+            if file_content is None:
+                results[file_name] = None
+                continue
+            file_id = self.get_file_metadata(folder_name, file_name)['id']
+            try:
+                output_path = self.file_handler.save_file(file_content, f"{file_id}.{self._export_extension(export_format)}")
+                uuid, new_uuid_added = self.file_handler.update_file_with_uuid(output_path)
+            except Exception as e:
+                print(f"Error processing Google Docs file '{file_name}': {e}")
+                results[file_name] = None
+                continue
+            if new_uuid_added:
+                new_uuids[file_id] = (file_name, uuid)
+            results[file_name] = (output_path, uuid)
+        stamped = self.stamp_uuids({file_id: uuid for file_id, (_, uuid) in new_uuids.items()})
+        for file_id, (file_name, _) in new_uuids.items():
+            if not stamped[file_id]:
+                results[file_name] = None
+        return results
+
+    def read_google_docs(self, folder_name, file_name, output_file_name=None, export_format=DOCX_MIME_TYPE):
         """
         Exports a Google Docs file from a specified folder, adds a UUID if necessary, and saves it locally.
 
@@ -103,7 +556,8 @@ class DriveContentManager:
         Args:
             folder_name (str): The name of the folder containing the Google Docs file.
             file_name (str): The name of the Google Docs file to retrieve.
-            output_file_name (str): The local file name where the exported file should be saved. Defaults to "output.docx".
+            output_file_name (str, optional): The local file name where the exported file should be saved. Defaults to
+                "output" with the extension of the export format, e.g. "output.docx".
             export_format (str, optional): The MIME type to export the file in. Default is "application/vnd.openxmlformats-officedocument.wordprocessingml.document" (i.e., .docx format).
 
         Returns:
@@ -118,10 +572,9 @@ class DriveContentManager:
                     or there is a problem with updating the document.
         """
         try:
-            # Get file metadata using get_file_from_folder
-            if folder_name in self.content_identifiers and file_name in self.content_identifiers[folder_name]:
-                file_metadata = self.get_file_from_folder(self.folder_ids[folder_name], file_name)
-            else:
+            # Get file metadata from the folder index
+            file_metadata = self.get_file_metadata(folder_name, file_name)
+            if file_metadata is None:
                 print("No such file or folder found.")
                 return None
             # Retrieve the file ID from the metadata
@@ -131,27 +584,14 @@ class DriveContentManager:
             # Execute the request to get the file content in bytes
             file_content = request.execute()
             # Save the file locally using FileHandler
+            output_file_name = output_file_name or f"output.{self._export_extension(export_format)}"
             output_path = self.file_handler.save_file(file_content, output_file_name)
             print(f"Google Docs file saved as {output_path}")
             # Add a UUID to the file if not already present
             uuid, new_uuid_added = self.file_handler.update_file_with_uuid(output_path)
             if new_uuid_added:
                 # Update the Google Docs file with the new UUID using the Google Docs API
-                self.docs_service.documents().batchUpdate(
-                    documentId=file_id,
-                    body={
-                        "requests": [
-                            {
-                                "insertText": {
-                                    "location": {
-                                        "index": 1  # Assuming index 1 is the start of the document
-                                    },
-                                    "text": f"File Id: \"{uuid}\"\n"
-                                }
-                            }
-                        ]
-                    }
-                ).execute()
+                self._uuid_stamp_request(file_id, uuid).execute()
                 print(f"UUID '{uuid}' added to the Google Docs file.")
             return output_path, uuid
         except Exception as e:
@@ -172,10 +612,9 @@ class DriveContentManager:
             str: The local path of the saved file if successful, None if an error occurs.
         """
         try:
-            # Get file metadata using get_file_from_folder
-            if folder_name in self.content_identifiers and file_name in self.content_identifiers[folder_name]:
-                file_metadata = self.get_file_from_folder(self.folder_ids[folder_name], file_name)
-            else:
+            # Get file metadata from the folder index
+            file_metadata = self.get_file_metadata(folder_name, file_name)
+            if file_metadata is None:
                 print("No such file or folder found.")
                 return None
             file_id = file_metadata['id']
@@ -202,18 +641,43 @@ class DriveContentManager:
         """
         try:
             self.drive_service.files().delete(fileId=file_id).execute()
+            self._forget_file(file_id)
             print(f"File {file_id} deleted successfully.")
             return True
         except HttpError as error:
             print(f"Error removing file: {error}")
             return False
+
+    def remove_many(self, file_ids):
+        """
+        Deletes several Google Docs files by their IDs using batched Google Drive API calls.
+
+        Args:
+            file_ids (list): The IDs of the Google Docs files to delete.
+
+        Returns:
+            dict: A dictionary mapping each file ID to True if the file was deleted, False otherwise.
+        """
+        requests = {file_id: self.drive_service.files().delete(fileId=file_id) for file_id in file_ids}
+        _, errors = self._execute_batch(self.drive_service, requests)
+        for file_id in requests:
+            if file_id in errors:
+                print(f"Error removing file {file_id}: {errors[file_id]}")
+            else:
+                self._forget_file(file_id)
+        print(f"Deleted {len(requests) - len(errors)} of {len(requests)} files.")
+        return {file_id: file_id not in errors for file_id in requests}
         
 # if __name__ == "__main__":
 #     # Test function
 #     from utils.drive_folders.folder_ids_map import folder_ids
 #     drive_c_manager = DriveContentManager(folder_ids)
+#     # from db_manager import FirestoreManager
+#     # drive_c_manager = DriveContentManager(folder_ids, sync_state_store=FirestoreManager())
+#     # print(drive_c_manager.sync_changes())
 #     # drive_c_manager.download_md_from_drive("codelabs", "TestCodelab")
 #     drive_c_manager.read_google_docs("projects", "TestDocs")
+#     # print(drive_c_manager.export_many("projects", ["TestDocs", "TestDocs2"]))
 #     drive_c_manager.download_md_from_drive("projects", "TestDocs")
 #     # drive_c_manager.file_handler.cleanup()
 
@@ -0,0 +1,234 @@
+from config.settings import DRIVE_EXPORT_CONCURRENCY, GCS_UPLOAD_CONCURRENCY, GEMINI_CONCURRENCY, FIRESTORE_WRITE_CONCURRENCY
+from gemini_processor import get_project_extractor
+from dataclasses import dataclass, field
+from typing import List
+import logging
+import queue
+import threading
+import time
+
+_STOP = object()  # Sentinel telling a stage worker that no more documents will arrive
+
+@dataclass
+class StageStats:
+    """
+    Represents the counters of one pipeline stage.
+    """
+    name: str
+    workers: int
+    processed: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    started_at: float = None
+    finished_at: float = None
+
+    @property
+    def throughput(self):
+        """
+        Returns the number of documents processed per second of stage wall time.
+        """
+        if not self.started_at or not self.finished_at or self.finished_at <= self.started_at:
+            return 0.0
+        return self.processed / (self.finished_at - self.started_at)
+
+@dataclass
+class DocumentResult:
+    """
+    Represents the state of one document travelling through the pipeline.
+    """
+    file_name: str
+    file_id: str = None
+    payload: object = None  # Output of the last completed stage
+    failed_stage: str = None
+    error: str = None
+
+@dataclass
+class PipelineReport:
+    """
+    Represents the outcome of a pipeline run, with per-document results and per-stage counters.
+    """
+    documents: List[DocumentResult] = field(default_factory=list)
+    stages: List[StageStats] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def succeeded(self):
+        """
+        Returns the documents that went through every stage.
+        """
+        return [document for document in self.documents if document.error is None]
+
+    @property
+    def failed(self):
+        """
+        Returns the documents that failed in one of the stages.
+        """
+        return [document for document in self.documents if document.error is not None]
+
+    def summary(self):
+        """
+        Returns a human readable summary of the run.
+        """
+        lines = [f"Ingested {len(self.succeeded)}/{len(self.documents)} documents in {self.elapsed_seconds:.2f}s."]
+        for stage in self.stages:
+            lines.append(
+                f"  {stage.name}: {stage.processed} ok, {stage.failed} failed, "
+                f"{stage.throughput:.2f} docs/s, {stage.busy_seconds:.2f}s busy over {stage.workers} workers"
+            )
+        for document in self.failed:
+            lines.append(f"  '{document.file_name}' failed in {document.failed_stage}: {document.error}")
+        return "\n".join(lines)
+
+class ProjectIngestionPipeline:
+    """
+    Ingests every document of a Drive folder by running each one through the export, image
+    publishing, Gemini extraction and Firestore write stages.
+
+    Stages run concurrently, each on its own bounded pool of worker threads, and are connected by
+    bounded queues so that a slow stage applies backpressure to the stages feeding it. A document
+    failing in any stage is reported and dropped without affecting the other documents.
+
+    Attributes:
+        drive_manager (DriveContentManager): The manager used to export documents from Drive.
+        gcs_manager (GcsManager): The manager used to publish the images embedded in the documents.
+        firestore_manager (FirestoreManager): The manager used to store the extracted projects.
+        extractor (ProjectExtractor): The extractor shared by the extraction workers.
+    """
+
+    def __init__(self, drive_manager, gcs_manager, firestore_manager,
+                 export_workers=DRIVE_EXPORT_CONCURRENCY, upload_workers=GCS_UPLOAD_CONCURRENCY,
+                 gemini_workers=GEMINI_CONCURRENCY, store_workers=FIRESTORE_WRITE_CONCURRENCY, extractor=None):
+        """
+        Initializes the pipeline with its managers and the number of workers of each stage.
+
+        Args:
+            drive_manager (DriveContentManager): The manager used to export documents from Drive.
+            gcs_manager (GcsManager): The manager used to publish the images embedded in the documents.
+            firestore_manager (FirestoreManager): The manager used to store the extracted projects.
+            export_workers (int, optional): The maximum number of concurrent Drive exports.
+            upload_workers (int, optional): The maximum number of documents publishing images at the same time.
+            gemini_workers (int, optional): The maximum number of concurrent Gemini extractions.
+            store_workers (int, optional): The maximum number of concurrent Firestore writes.
+            extractor (ProjectExtractor, optional): The extractor shared by the extraction workers.
+                Defaults to the process-wide one.
+        """
+        self.drive_manager = drive_manager
+        self.gcs_manager = gcs_manager
+        self.firestore_manager = firestore_manager
+        self.extractor = extractor or get_project_extractor()
+        # Firestore upserts are transactional, so the store stage can run concurrently
+        self.stages = [
+            ("export", self._export, export_workers),
+            ("publish_images", self._publish_images, upload_workers),
+            ("extract", self._extract, gemini_workers),
+            ("store", self._store, store_workers),
+        ]
+
+    def _export(self, document):
+        return self.drive_manager.export_file(document.file_id, "text/markdown").decode("utf-8")
+
+    def _publish_images(self, document):
+        modified_content, _ = self.gcs_manager.publish_image_assets(document.payload)
+        return modified_content
+
+    def _extract(self, document):
+        return self.extractor.extract(document.payload, project_id=document.file_id)
+
+    def _store(self, document):
+        # Upserting by id replaces the previous version of a re-processed project instead of duplicating it
+        if not self.firestore_manager.upsert_entity("projects", document.payload):
+            raise RuntimeError(f"Failed to store project '{document.payload['id']}'.")
+        return document.payload
+
+    def _run_worker(self, stage_name, process, stats, stats_lock, in_queue, out_queue, workers_left, next_workers):
+        """
+        Runs one worker of a stage until it receives the stop sentinel. The last worker of the stage
+        to stop forwards one sentinel per worker of the next stage.
+        """
+        while True:
+            document = in_queue.get()
+            if document is _STOP:
+                break
+            start = time.perf_counter()
+            try:
+                document.payload = process(document)
+                succeeded = True
+            except Exception as e:
+                document.failed_stage, document.error = stage_name, str(e)
+                logging.error(f"Document '{document.file_name}' failed in stage '{stage_name}': {e}")
+                succeeded = False
+            end = time.perf_counter()
+            with stats_lock:
+                stats.busy_seconds += end - start
+                stats.started_at = stats.started_at or start
+                stats.finished_at = end
+                if succeeded:
+                    stats.processed += 1
+                else:
+                    stats.failed += 1
+            if succeeded and out_queue is not None:
+                # Blocks while the next stage is saturated, which propagates backpressure upstream
+                out_queue.put(document)
+        with stats_lock:
+            workers_left[0] -= 1
+            last_worker = workers_left[0] == 0
+        if last_worker and out_queue is not None:
+            for _ in range(next_workers):
+                out_queue.put(_STOP)
+
+    def run(self, folder_name="projects", file_names=None):
+        """
+        Ingests the documents of a Drive folder through every stage.
+
+        Args:
+            folder_name (str, optional): The name of the monitored folder to ingest. Defaults to "projects".
+            file_names (list, optional): The documents to ingest. Defaults to every document in the folder.
+
+        Returns:
+            PipelineReport: The per-document results and the per-stage counters of the run.
+        """
+        start = time.perf_counter()
+        if file_names is None:
+            file_names = list(self.drive_manager.content_identifiers.get(folder_name, {}))
+        report = PipelineReport(stages=[StageStats(name, workers) for name, _, workers in self.stages])
+        # Each queue holds at most two documents per consuming worker
+        queues = [queue.Queue(maxsize=2 * workers) for _, _, workers in self.stages]
+        stats_lock = threading.Lock()
+        threads = []
+        for index, (name, process, workers) in enumerate(self.stages):
+            out_queue = queues[index + 1] if index + 1 < len(queues) else None
+            next_workers = self.stages[index + 1][2] if out_queue is not None else 0
+            workers_left = [workers]
+            for _ in range(workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    args=(name, process, report.stages[index], stats_lock, queues[index], out_queue, workers_left, next_workers),
+                    daemon=True
+                )
+                thread.start()
+                threads.append(thread)
+        # Feed the first stage; resolving file IDs here keeps index lookups on a single thread
+        for file_name in file_names:
+            document = DocumentResult(file_name)
+            report.documents.append(document)
+            file_metadata = self.drive_manager.get_file_metadata(folder_name, file_name)
+            if file_metadata is None:
+                document.failed_stage, document.error = "resolve", f"No such file in folder '{folder_name}'."
+                continue
+            document.file_id = file_metadata['id']
+            queues[0].put(document)
+        for _ in range(self.stages[0][2]):
+            queues[0].put(_STOP)
+        for thread in threads:
+            thread.join()
+        report.elapsed_seconds = time.perf_counter() - start
+        logging.info(report.summary())
+        return report
+
+# if __name__ == "__main__":
+#     # Test function
+#     from utils.drive_folders.folder_ids_map import folder_ids
+#     from handlers import DriveContentManager
+#     from db_manager import FirestoreManager, GcsManager
+#     pipeline = ProjectIngestionPipeline(DriveContentManager(folder_ids), GcsManager(bucket_name="gdg-fisk-assets"), FirestoreManager())
+#     print(pipeline.run("projects").summary())
@@ -1,2 +1,3 @@
 class DriveNotificationHandler():
-    # TODO: Implement a Drive API Web Hook Handler
\ No newline at end of file
+    # TODO: Implement a Drive API Web Hook Handler
+    pass
@@ -1,2 +1,3 @@
 class GithubContentManager():
-    # Implement Github Organizational Repo Content Manager
\ No newline at end of file
+    # Implement Github Organizational Repo Content Manager
+    pass
@@ -1,2 +1,3 @@
 class GithubNotificationHandler():
-    # Implement Github Organizational Web Hook Handler
\ No newline at end of file
+    # Implement Github Organizational Web Hook Handler
+    pass
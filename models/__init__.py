@@ -12,6 +12,8 @@ from .codelabs import KeyLearning, Codelab, CodelabsPageResponse
 from .culture import CulturePageResponse
 from .home import HomePageResponse
 from .projects import Project, ProjectsPageResponse
+from .schema import dataclass_schema
+from .serialization import Model, ModelValidationError, serializer, deserializer, parse, decode_value
 
 __all__ = [
     "TextContent",
@@ -29,4 +31,11 @@ __all__ = [
     "HomePageResponse",
     "Project",
     "ProjectsPageResponse",
+    "dataclass_schema",
+    "Model",
+    "serializer",
+    "deserializer",
+    "ModelValidationError",
+    "parse",
+    "decode_value",
 ]
@@ -1,25 +1,17 @@
 from dataclasses import dataclass
 from typing import Optional, List
+from .serialization import Model
 
-@dataclass
-class KeyLearning:
+@dataclass(slots=True, frozen=True)
+class KeyLearning(Model):
     """
     Represents a key learning item with content and an optional icon.
     """
     content: str
     icon: Optional[str] = None
 
-    def to_dict(self):
-        """
-        Converts the KeyLearning object to a dictionary.
-        """
-        return {
-            "content": self.content,
-            "icon": self.icon,
-        }
-
-@dataclass
-class Codelab:
+@dataclass(slots=True)
+class Codelab(Model):
     """
     Represents a codelab with its details, including key learnings.
     """
@@ -31,31 +23,9 @@ class Codelab:
     releasedDate: str
     author: Optional[str] = None
 
-    def to_dict(self):
-        """
-        Converts the Codelab object to a dictionary.
-        """
-        return {
-            "id": self.id,
-            "screenshotUrl": self.screenshotUrl,
-            "gcsUrl": self.gcsUrl,
-            "title": self.title,
-            "keyLearnings": [learning.to_dict() for learning in self.keyLearnings],
-            "releasedDate": self.releasedDate,
-            "author": self.author,
-        }
-
-@dataclass
-class CodelabsPageResponse:
+@dataclass(slots=True)
+class CodelabsPageResponse(Model):
     """
     Represents the response for the codelabs page, including a list of codelabs.
     """
     codelabs: List[Codelab]
-
-    def to_dict(self):
-        """
-        Converts the CodelabsPageResponse object to a dictionary.
-        """
-        return {
-            "codelabs": [codelab.to_dict() for codelab in self.codelabs]
-        }
\ No newline at end of file
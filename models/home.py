@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 from typing import List
+from .serialization import Model
 from .common import ProjectSummary, Testimonial
 
-@dataclass
-class HomePageResponse:
+@dataclass(slots=True)
+class HomePageResponse(Model):
     """
     Represents the response for the home page, including a home video URL,
     project summaries, and testimonials.
@@ -11,13 +12,3 @@ class HomePageResponse:
     homeVideoUrl: str
     projectSummaries: List[ProjectSummary]
     testimonials: List[Testimonial]
-
-    def to_dict(self):
-        """
-        Converts the HomePageResponse object to a dictionary.
-        """
-        return {
-            "homeVideoUrl": self.homeVideoUrl,
-            "projectSummaries": [summary.to_dict() for summary in self.projectSummaries],
-            "testimonials": [testimonial.to_dict() for testimonial in self.testimonials],
-        }
\ No newline at end of file
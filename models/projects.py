@@ -1,9 +1,10 @@
 from dataclasses import dataclass
 from typing import Optional, List
-from .common import Section, VideoContent
+from .serialization import Model
+from .common import Section, VideoContent, ProjectSummary
 
-@dataclass
-class Project:
+@dataclass(slots=True)
+class Project(Model):
     """
     Represents a project with details such as ID, hero image, title, overview,
     problem statement, features, demo video, and relevant links.
@@ -19,34 +20,10 @@ class Project:
     relevantLinks: List[str]
     author: Optional[str] = None
 
-    def to_dict(self):
-        """
-        Converts the Project object to a dictionary.
-        """
-        return {
-            "id": self.id,
-            "projectHeroImg": self.projectHeroImg,
-            "projectTitle": self.projectTitle,
-            "readTimeInMins": self.readTimeInMins,
-            "overview": self.overview.to_dict(), 
-            "problemStatement": self.problemStatement,
-            "features": self.features.to_dict(),
-            "demo": self.demo.to_dict(),
-            "relevantLinks": self.relevantLinks,
-            "author": self.author,
-        }
-
-@dataclass
-class ProjectsPageResponse:
+@dataclass(slots=True)
+class ProjectsPageResponse(Model):
     """
-    Represents the response for the projects page, including a list of projects.
+    Represents the response for the projects page, including the summaries of the projects.
+    Full projects are stored as separate documents and read by id.
     """
-    projects: List[Project]
-
-    def to_dict(self):
-        """
-        Converts the ProjectsPageResponse object to a dictionary.
-        """
-        return {
-            "projects": [project.to_dict() for project in self.projects]
-        }
\ No newline at end of file
+    projects: List[ProjectSummary]
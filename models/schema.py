@@ -0,0 +1,54 @@
+import dataclasses
+import functools
+import typing
+
+# Vertex AI schema types of the supported field annotations
+SCHEMA_TYPES = {
+    str: "STRING",
+    int: "INTEGER",
+    float: "NUMBER",
+    bool: "BOOLEAN",
+}
+
+def _field_schema(annotation):
+    """
+    Builds the schema of a field annotation: a scalar type, an Optional, a List or a nested dataclass.
+    """
+    if typing.get_origin(annotation) is typing.Union:
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        return {**_field_schema(arguments[0]), "nullable": True}
+    if typing.get_origin(annotation) is list:
+        return {"type": "ARRAY", "items": _field_schema(typing.get_args(annotation)[0])}
+    if dataclasses.is_dataclass(annotation):
+        return dataclass_schema(annotation)
+    if annotation in SCHEMA_TYPES:
+        return {"type": SCHEMA_TYPES[annotation]}
+    raise TypeError(f"Unsupported field type {annotation!r}.")
+
+@functools.cache
+def dataclass_schema(model, exclude=()):
+    """
+    Generates the response schema of a model dataclass, in the OpenAPI subset accepted by Gemini
+    as `response_schema`. Fields with a default value are optional; Optional fields are nullable.
+
+    Args:
+        model (type): The dataclass, e.g. `Project`.
+        exclude (tuple, optional): The names of top-level fields to leave out of the schema,
+            e.g. fields computed locally instead of generated.
+
+    Returns:
+        dict: The schema of the dataclass. It is cached and must not be modified.
+
+    Raises:
+        TypeError: If a field has an annotation without a schema equivalent.
+    """
+    hints = typing.get_type_hints(model)
+    fields = [field for field in dataclasses.fields(model) if field.name not in exclude]
+    return {
+        "type": "OBJECT",
+        "properties": {field.name: _field_schema(hints[field.name]) for field in fields},
+        "required": [
+            field.name for field in fields
+            if field.default is dataclasses.MISSING and field.default_factory is dataclasses.MISSING
+        ],
+    }
@@ -0,0 +1,276 @@
+import dataclasses
+import functools
+import typing
+
+_INVALID = object()  # Returned by the field decoders of invalid values, whose errors are recorded
+
+class ModelValidationError(ValueError):
+    """
+    Raised when data cannot be decoded into a model.
+
+    Attributes:
+        errors (list): The (path, message) of every invalid field, e.g. ('Project.demo.title', 'missing required field').
+    """
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__("; ".join(f"{path}: {message}" for path, message in errors))
+
+def _field_code(annotation, value, namespace, converters):
+    """
+    Returns the expression converting `value`, an expression of the given annotation, with the
+    given converters: `serializer` or `deserializer`. Scalars and lists of scalars are not copied.
+    """
+    if typing.get_origin(annotation) is typing.Union:
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        code = _field_code(arguments[0], value, namespace, converters)
+        return code if code == value else f"(None if {value} is None else {code})"
+    if typing.get_origin(annotation) is list:
+        item_code = _field_code(typing.get_args(annotation)[0], "item", namespace, converters)
+        return value if item_code == "item" else f"[{item_code} for item in {value}]"
+    if dataclasses.is_dataclass(annotation):
+        name = f"_{converters.__name__}_{annotation.__name__}"
+        namespace[name] = converters(annotation)
+        return f"{name}({value})"
+    return value
+
+def _compile(name, source, namespace):
+    exec(source, namespace)
+    return namespace[name]
+
+@functools.cache
+def serializer(model):
+    """
+    Generates the function converting an instance of a model dataclass, and its nested models,
+    to a dictionary. Unlike `dataclasses.asdict`, values are not deep-copied: strings and lists
+    of scalars are shared with the instance.
+
+    Args:
+        model (type): The dataclass, e.g. `Project`.
+
+    Returns:
+        callable: The function taking an instance and returning its dictionary.
+    """
+    hints = typing.get_type_hints(model)
+    namespace = {}
+    items = ", ".join(
+        f"{field.name!r}: {_field_code(hints[field.name], f'obj.{field.name}', namespace, serializer)}"
+        for field in dataclasses.fields(model)
+    )
+    return _compile("to_dict", f"def to_dict(obj):\n    return {{{items}}}\n", namespace)
+
+@functools.cache
+def deserializer(model):
+    """
+    Generates the function building an instance of a model dataclass, and its nested models,
+    from a dictionary. Keys that are not fields, such as 'lastUpdated', are ignored, and missing
+    fields with a default value take it.
+
+    Args:
+        model (type): The dataclass, e.g. `Project`.
+
+    Returns:
+        callable: The function taking a dictionary and returning the instance.
+
+    Raises:
+        KeyError: From the generated function, if a required field is missing.
+    """
+    hints = typing.get_type_hints(model)
+    namespace = {"model": model}
+    arguments = []
+    for field in dataclasses.fields(model):
+        value = f"data[{field.name!r}]"
+        if field.default is not dataclasses.MISSING:
+            namespace[f"_default_{field.name}"] = field.default
+            value = f"data.get({field.name!r}, _default_{field.name})"
+        elif field.default_factory is not dataclasses.MISSING:
+            namespace[f"_factory_{field.name}"] = field.default_factory
+            value = f"(data[{field.name!r}] if {field.name!r} in data else _factory_{field.name}())"
+        arguments.append(f"{field.name}={_field_code(hints[field.name], value, namespace, deserializer)}")
+    return _compile("from_dict", f"def from_dict(data):\n    return model({', '.join(arguments)})\n", namespace)
+
+def _coerce_int(value):
+    if isinstance(value, bool):
+        return _INVALID
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value.strip())
+        except ValueError:
+            return _INVALID
+    return _INVALID
+
+def _coerce_float(value):
+    if isinstance(value, bool):
+        return _INVALID
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return _INVALID
+    return _INVALID
+
+def _coerce_str(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return _INVALID
+
+def _coerce_bool(value):
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    return _INVALID
+
+# Coercion of the scalar field types, with the name of the expected type used in error messages
+SCALAR_COERCIONS = {
+    int: (_coerce_int, "an integer"),
+    float: (_coerce_float, "a number"),
+    str: (_coerce_str, "a string"),
+    bool: (_coerce_bool, "a boolean"),
+}
+
+@functools.cache
+def _field_decoder(annotation, ignore_unknown):
+    """
+    Builds the validating decoder of a field annotation. Decoders take the value, its path and
+    the list of errors, and return the decoded value, or `_INVALID` after recording errors.
+    """
+    if typing.get_origin(annotation) is typing.Union:
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        decode_value = _field_decoder(arguments[0], ignore_unknown)
+
+        def decode_optional(value, path, errors):
+            return None if value is None else decode_value(value, path, errors)
+        return decode_optional
+    if typing.get_origin(annotation) is list:
+        decode_item = _field_decoder(typing.get_args(annotation)[0], ignore_unknown)
+
+        def decode_list(value, path, errors):
+            if not isinstance(value, (list, tuple)):
+                errors.append((path, f"expected a list, got {type(value).__name__}"))
+                return _INVALID
+            items = [decode_item(item, f"{path}[{index}]", errors) for index, item in enumerate(value)]
+            return _INVALID if any(item is _INVALID for item in items) else items
+        return decode_list
+    if dataclasses.is_dataclass(annotation):
+        return _model_decoder(annotation, ignore_unknown)
+    coerce, expected = SCALAR_COERCIONS[annotation]
+
+    def decode_scalar(value, path, errors):
+        decoded = _INVALID if value is None else coerce(value)
+        if decoded is _INVALID:
+            errors.append((path, f"expected {expected}, got {value!r}"))
+        return decoded
+    return decode_scalar
+
+@functools.cache
+def _model_decoder(model, ignore_unknown):
+    """
+    Builds the validating decoder of a model dataclass, see `_field_decoder`.
+    """
+    hints = typing.get_type_hints(model)
+    plan = [
+        (field.name, _field_decoder(hints[field.name], ignore_unknown), field.default, field.default_factory)
+        for field in dataclasses.fields(model)
+    ]
+    names = {field.name for field in dataclasses.fields(model)}
+
+    def decode_model(value, path, errors):
+        if not isinstance(value, dict):
+            errors.append((path, f"expected an object, got {type(value).__name__}"))
+            return _INVALID
+        error_count = len(errors)
+        if not ignore_unknown:
+            errors.extend((f"{path}.{key}", "unexpected field") for key in sorted(value.keys() - names))
+        arguments = {}
+        for name, decode_value, default, default_factory in plan:
+            if name in value:
+                arguments[name] = decode_value(value[name], f"{path}.{name}", errors)
+            elif default is not dataclasses.MISSING:
+                arguments[name] = default
+            elif default_factory is not dataclasses.MISSING:
+                arguments[name] = default_factory()
+            else:
+                errors.append((f"{path}.{name}", "missing required field"))
+        return _INVALID if len(errors) > error_count else model(**arguments)
+    return decode_model
+
+def decode_value(annotation, value, path, ignore_unknown=True):
+    """
+    Decodes one untrusted value of a field annotation, with the validation and coercion of `parse`.
+
+    Args:
+        annotation (type): The annotation of the field, e.g. `int` or `List[TextContent]`.
+        value: The value to decode.
+        path (str): The path of the value, used in error messages.
+        ignore_unknown (bool, optional): Whether keys that are not fields of nested models are ignored.
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ModelValidationError: If the value or any of its items is invalid.
+    """
+    errors = []
+    decoded = _field_decoder(annotation, ignore_unknown)(value, path, errors)
+    if errors:
+        raise ModelValidationError(errors)
+    return decoded
+
+def parse(model, data, ignore_unknown=True):
+    """
+    Decodes untrusted data, e.g. generated JSON, into a model dataclass, validating every field.
+    Values of the wrong type are coerced when the conversion is lossless, such as "8" or 8.0 for
+    an integer, and every invalid field is reported at once.
+
+    Args:
+        model (type): The dataclass, e.g. `Project`.
+        data (dict): The data to decode.
+        ignore_unknown (bool, optional): Whether keys that are not fields are ignored, e.g.
+            'lastUpdated' in Firestore documents, instead of reported as errors.
+
+    Returns:
+        The model instance.
+
+    Raises:
+        ModelValidationError: If any field is missing or invalid.
+    """
+    errors = []
+    instance = _model_decoder(model, ignore_unknown)(data, model.__name__, errors)
+    if errors:
+        raise ModelValidationError(errors)
+    return instance
+
+class Model:
+    """
+    Base class of the model dataclasses, providing their generated serialization.
+    """
+    __slots__ = ()
+
+    def to_dict(self):
+        """
+        Converts the object to a dictionary.
+        """
+        return serializer(type(self))(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds an object from a trusted dictionary, e.g. a Firestore document written from a model.
+        """
+        return deserializer(cls)(data)
+
+    @classmethod
+    def parse(cls, data, ignore_unknown=True):
+        """
+        Builds an object from untrusted data, validating and coercing every field, see `parse`.
+        """
+        return parse(cls, data, ignore_unknown)
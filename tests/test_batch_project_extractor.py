@@ -0,0 +1,45 @@
+import json
+import tempfile
+import unittest
+
+from gemini_processor.batch_project_extractor import BatchProjectExtractor, LocalBatchBackend
+from gemini_processor.values.base_project_template_values import PROJECT_GENERATION_CONFIG
+
+README = "# Weather App\n\nShows the forecast of the day. ![Screen](https://example.com/screen.png)\n"
+RESPONSE = json.dumps({
+    "projectHeroImg": "img://1",
+    "projectTitle": "Weather App",
+    "overview": {"textContents": [{"content": "Shows the forecast of the day.", "imgUrl": None}]},
+    "problemStatement": "Checking the forecast takes too long.",
+    "features": {"textContents": [{"content": "Daily forecast.", "imgUrl": "img://1"}]},
+    "demo": {"title": "Demo", "imgUrl": "img://1", "videoUrl": "/", "genres": ["WEATHER"]},
+})
+
+class BatchProjectExtractorTest(unittest.TestCase):
+    def test_local_backend_receives_the_response_schema(self):
+        generation_configs = []
+
+        def generate(prompt, generation_config=None):
+            generation_configs.append(generation_config)
+            return RESPONSE
+
+        extractor = BatchProjectExtractor(backend=LocalBatchBackend(generate), work_dir=tempfile.mkdtemp())
+        results = {key: (project, error) for key, project, error in extractor.extract({"drive-file-1": README})}
+
+        self.assertEqual(generation_configs, [PROJECT_GENERATION_CONFIG])
+        project, error = results["drive-file-1"]
+        self.assertIsNone(error)
+        self.assertEqual(project["id"], "drive-file-1")
+        self.assertEqual(project["projectHeroImg"], "https://example.com/screen.png")
+
+    def test_readme_without_stable_id_is_rejected_alone(self):
+        extractor = BatchProjectExtractor(backend=LocalBatchBackend(lambda prompt, generation_config=None: RESPONSE),
+                                          work_dir=tempfile.mkdtemp())
+        results = {key: (project, error) for key, project, error in extractor.extract({"": README, "drive-file-1": README})}
+
+        self.assertIsNone(results[""][0])
+        self.assertIn("no stable id", results[""][1])
+        self.assertIsNone(results["drive-file-1"][1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import unittest
+
+from handlers.drive_handler.content_manager import DriveContentManager, SYNC_STATE_DOCUMENT, START_PAGE_TOKEN_FIELD, FOLDER_INDEX_FIELD
+
+FOLDER_IDS = {"projects": "projects-folder", "codelabs": "codelabs-folder"}
+
+def drive_file(file_id, name, parents, version="1", trashed=False):
+    return {"id": file_id, "name": name, "modifiedTime": "2024-01-01T00:00:00Z", "version": version,
+            "parents": parents, "trashed": trashed}
+
+class FakeRequest:
+    def __init__(self, response):
+        self.response = response
+
+    def execute(self):
+        return self.response
+
+class FakeFiles:
+    """
+    Serves `files.list` from pages of files per folder, keyed by page token.
+    """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.calls = []
+
+    def list(self, q, fields, pageSize=None, pageToken=None):
+        self.calls.append((q, pageToken))
+        folder_id = q.split("'")[1]
+        files, next_page_token = self.pages[folder_id][pageToken]
+        response = {"files": files}
+        if next_page_token is not None:
+            response["nextPageToken"] = next_page_token
+        return FakeRequest(response)
+
+class FakeChanges:
+    """
+    Serves `changes.list` from pages of changes keyed by page token.
+    """
+
+    def __init__(self, pages, start_page_token="1"):
+        self.pages = pages
+        self.start_page_token = start_page_token
+        self.calls = []
+
+    def getStartPageToken(self):
+        return FakeRequest({"startPageToken": self.start_page_token})
+
+    def list(self, pageToken, spaces, includeRemoved, pageSize, fields):
+        self.calls.append(pageToken)
+        return FakeRequest(self.pages[pageToken])
+
+class FakeDriveService:
+    def __init__(self, file_pages, change_pages=None):
+        self.fake_files = FakeFiles(file_pages)
+        self.fake_changes = FakeChanges(change_pages or {})
+
+    def files(self):
+        return self.fake_files
+
+    def changes(self):
+        return self.fake_changes
+
+class FakeSyncStateStore:
+    """
+    Holds the sync state document in memory, like `FirestoreManager` merging written fields.
+    """
+
+    def __init__(self, document=None):
+        self.document = dict(document or {})
+
+    def read_field(self, doc_name, field_name):
+        assert doc_name == SYNC_STATE_DOCUMENT
+        return self.document.get(field_name)
+
+    def update_document(self, doc_name, data):
+        assert doc_name == SYNC_STATE_DOCUMENT
+        self.document.update(data)
+
+FILE_PAGES = {
+    "projects-folder": {
+        None: ([drive_file("p1", "Alpha", ["projects-folder"])], "page-2"),
+        "page-2": ([drive_file("p2", "Beta", ["projects-folder"])], None),
+    },
+    "codelabs-folder": {
+        None: ([drive_file("c1", "Intro", ["codelabs-folder"])], None),
+    },
+}
+
+class DriveContentManagerTest(unittest.TestCase):
+    def create_manager(self, drive_service, sync_state_store=None):
+        return DriveContentManager(FOLDER_IDS, sync_state_store=sync_state_store, drive_service=drive_service, docs_service=object())
+
+    def test_listing_follows_every_page(self):
+        drive_service = FakeDriveService(FILE_PAGES)
+        manager = self.create_manager(drive_service)
+        self.assertEqual(set(manager.content_identifiers["projects"]), {"Alpha", "Beta"})
+        self.assertEqual(manager.content_identifiers["codelabs"]["Intro"]["id"], "c1")
+        self.assertIn(("'projects-folder' in parents and trashed = false", "page-2"), drive_service.fake_files.calls)
+
+    def test_first_start_stores_token_and_index(self):
+        store = FakeSyncStateStore()
+        manager = self.create_manager(FakeDriveService(FILE_PAGES), store)
+        self.assertEqual(store.document[START_PAGE_TOKEN_FIELD], "1")
+        self.assertEqual(store.document[FOLDER_INDEX_FIELD], manager.content_identifiers)
+
+    def test_start_with_stored_token_restores_index_without_listing(self):
+        store = FakeSyncStateStore()
+        self.create_manager(FakeDriveService(FILE_PAGES), store)
+        drive_service = FakeDriveService(FILE_PAGES)
+        manager = self.create_manager(drive_service, store)
+        self.assertEqual(drive_service.fake_files.calls, [])
+        self.assertEqual(manager.get_file_metadata("projects", "Beta")["id"], "p2")
+
+    def test_start_relists_when_folders_changed(self):
+        store = FakeSyncStateStore({START_PAGE_TOKEN_FIELD: "1", FOLDER_INDEX_FIELD: {"projects": {}}})
+        drive_service = FakeDriveService(FILE_PAGES)
+        manager = self.create_manager(drive_service, store)
+        self.assertNotEqual(drive_service.fake_files.calls, [])
+        self.assertEqual(set(manager.content_identifiers), set(FOLDER_IDS))
+
+    def test_sync_changes_applies_every_page(self):
+        change_pages = {
+            "1": {"nextPageToken": "2", "changes": [
+                # Added to a monitored folder
+                {"fileId": "p3", "file": drive_file("p3", "Gamma", ["projects-folder"])},
+                # Modified
+                {"fileId": "p1", "file": drive_file("p1", "Alpha", ["projects-folder"], version="2")},
+                # Outside every monitored folder
+                {"fileId": "x1", "file": drive_file("x1", "Other", ["other-folder"])},
+            ]},
+            "2": {"newStartPageToken": "3", "changes": [
+                # Trashed
+                {"fileId": "p2", "file": drive_file("p2", "Beta", ["projects-folder"], trashed=True)},
+                # Moved out of the monitored folders
+                {"fileId": "c1", "file": drive_file("c1", "Intro", ["other-folder"])},
+            ]},
+        }
+        store = FakeSyncStateStore()
+        drive_service = FakeDriveService(FILE_PAGES, change_pages)
+        manager = self.create_manager(drive_service, store)
+
+        changes = manager.sync_changes()
+
+        self.assertEqual(drive_service.fake_changes.calls, ["1", "2"])
+        self.assertEqual([(change["action"], change["file_id"]) for change in changes], [
+            ("added", "p3"), ("modified", "p1"), ("removed", "p2"), ("removed", "c1"),
+        ])
+        self.assertEqual(manager.content_identifiers, {
+            "projects": {
+                "Alpha": {"id": "p1", "modifiedTime": "2024-01-01T00:00:00Z", "md5Checksum": None, "version": "2"},
+                "Gamma": {"id": "p3", "modifiedTime": "2024-01-01T00:00:00Z", "md5Checksum": None, "version": "1"},
+            },
+            "codelabs": {},
+        })
+        self.assertEqual(store.document[START_PAGE_TOKEN_FIELD], "3")
+        self.assertEqual(store.document[FOLDER_INDEX_FIELD], manager.content_identifiers)
+
+    def test_removing_a_file_keeps_another_file_of_the_same_name(self):
+        change_pages = {
+            "1": {"newStartPageToken": "2", "changes": [
+                # A second document named like an indexed one replaces it in the index
+                {"fileId": "p4", "file": drive_file("p4", "Alpha", ["projects-folder"])},
+                # The first document is then trashed
+                {"fileId": "p1", "file": drive_file("p1", "Alpha", ["projects-folder"], trashed=True)},
+            ]},
+        }
+        manager = self.create_manager(FakeDriveService(FILE_PAGES, change_pages), FakeSyncStateStore())
+
+        manager.sync_changes()
+
+        self.assertEqual(manager.content_identifiers["projects"]["Alpha"]["id"], "p4")
+        self.assertEqual(manager.get_file_metadata("projects", "Alpha")["id"], "p4")
+
+    def test_sync_changes_without_token_lists_folders(self):
+        store = FakeSyncStateStore()
+        manager = self.create_manager(FakeDriveService(FILE_PAGES), store)
+        del store.document[START_PAGE_TOKEN_FIELD]
+        self.assertEqual(manager.sync_changes(), [])
+        self.assertEqual(store.document[START_PAGE_TOKEN_FIELD], "1")
+
+if __name__ == "__main__":
+    unittest.main()
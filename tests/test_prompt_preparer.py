@@ -0,0 +1,29 @@
+import unittest
+
+from gemini_processor.prompt_preparer import PromptPreparer
+
+README = """# Project
+
+![Architecture][image1]
+See the [repository][1] and the ![demo](https://example.com/demo.png).
+
+[1]: <https://github.com/org/repo>
+[image1]: <https://example.com/architecture.png>
+[logo]: <data:image/png;base64,iVBORw0KGgo=>
+"""
+
+class PromptPreparerTest(unittest.TestCase):
+    def test_strip_images_keeps_link_definitions(self):
+        preparer = PromptPreparer()
+        stripped, placeholders = preparer.strip_images(README)
+        self.assertIn("[1]: <https://github.com/org/repo>", stripped)
+        self.assertEqual(set(placeholders.values()), {
+            "https://example.com/architecture.png",
+            "https://example.com/demo.png",
+            "data:image/png;base64,iVBORw0KGgo=",
+        })
+        self.assertNotIn("example.com", stripped)
+        self.assertEqual(preparer.restore_images(stripped, placeholders), README)
+
+if __name__ == "__main__":
+    unittest.main()
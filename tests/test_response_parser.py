@@ -0,0 +1,27 @@
+import unittest
+
+from gemini_processor.chunked_extraction import merge_partial_projects
+from gemini_processor.response_parser import IncrementalJsonParser, MalformedResponseError
+
+class IncrementalJsonParserTest(unittest.TestCase):
+    def parse(self, text, chunk_size=7):
+        parser = IncrementalJsonParser(partial=True, exclude=("id", "readTimeInMins", "relevantLinks"))
+        for start in range(0, len(text), chunk_size):
+            parser.feed(text[start:start + chunk_size])
+        return parser.close()
+
+    def test_fields_are_stored_coerced(self):
+        fields = self.parse('{"projectTitle": 42, "overview": {"textContents": [{"content": 5}]}}')
+        self.assertEqual(fields["projectTitle"], "42")
+        self.assertEqual(fields["overview"], {"textContents": [{"content": "5", "imgUrl": None}]})
+
+    def test_coerced_partials_merge(self):
+        partials = [self.parse('{"overview": {"textContents": [{"content": 5}]}}')]
+        self.assertEqual(merge_partial_projects(partials)["overview"]["textContents"][0]["content"], "5")
+
+    def test_invalid_value_aborts(self):
+        with self.assertRaises(MalformedResponseError):
+            self.parse('{"projectTitle": ["not", "a", "title"]}')
+
+if __name__ == "__main__":
+    unittest.main()
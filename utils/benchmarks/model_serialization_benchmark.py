@@ -0,0 +1,70 @@
+"""
+Benchmarks the serialization of a page of projects, and the memory taken by the models.
+
+Compares `dataclasses.asdict` (before) with the generated model serializer (after) when converting
+hundreds of projects to dictionaries, measures the generated `from_dict` when parsing them back,
+and compares the size of slotted model instances with equivalent plain dataclasses.
+
+Run from the repository root:
+    python -m utils.benchmarks.model_serialization_benchmark [projects] [iterations]
+"""
+from dataclasses import asdict, dataclass, replace
+from models import Project, TextContent
+from typing import Optional
+from utils.samples.projects import sample_projects
+import sys
+import time
+import tracemalloc
+
+@dataclass
+class PlainTextContent:
+    """
+    TextContent without slots, as the models were defined before.
+    """
+    content: str
+    imgUrl: Optional[str] = None
+
+def measure(convert, iterations):
+    """
+    Returns the average duration of a call in milliseconds, and the peak memory allocated by one call in KiB.
+    """
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        convert()
+    duration = (time.perf_counter() - started_at) / iterations * 1e3
+    tracemalloc.start()
+    result = convert()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return duration, peak / 1024
+
+def instance_size(instance):
+    """
+    Returns the size of an instance and of its attribute dictionary, if any, in bytes.
+    """
+    return sys.getsizeof(instance) + (sys.getsizeof(instance.__dict__) if hasattr(instance, "__dict__") else 0)
+
+def main(project_count=500, iterations=20):
+    projects = [
+        replace(sample_projects[index % len(sample_projects)], id=f"project{index}")
+        for index in range(project_count)
+    ]
+    dictionaries = [project.to_dict() for project in projects]
+
+    before = measure(lambda: [asdict(project) for project in projects], iterations)
+    after = measure(lambda: [project.to_dict() for project in projects], iterations)
+    parse = measure(lambda: [Project.from_dict(data) for data in dictionaries], iterations)
+
+    print(f"Serializing {project_count} projects, average over {iterations} runs:")
+    print(f"  dataclasses.asdict:    {before[0]:8.2f} ms {before[1]:10.1f} KiB peak")
+    print(f"  generated to_dict:     {after[0]:8.2f} ms {after[1]:10.1f} KiB peak "
+          f"({before[0] / after[0]:.1f}x faster, {before[1] / after[1]:.1f}x less memory)")
+    print(f"Parsing {project_count} projects:")
+    print(f"  generated from_dict:   {parse[0]:8.2f} ms {parse[1]:10.1f} KiB peak")
+    print("Instance size of a text content:")
+    print(f"  plain dataclass:       {instance_size(PlainTextContent('content')):8d} bytes")
+    print(f"  slotted model:         {instance_size(TextContent('content')):8d} bytes")
+
+if __name__ == "__main__":
+    main(*(int(argument) for argument in sys.argv[1:3]))
@@ -0,0 +1,127 @@
+"""
+Benchmarks the rendering of project prompts and the size of the request payloads.
+
+Compares the original project prompt (before), a single template holding the few-shot example
+readme and output and the expected response format, rendered whole on every call, with the
+current prompt (after), whose static prefix is rendered once and whose readme suffix is rendered
+per call. The response format is now enforced by structured output instead of the prompt.
+
+Also reports whether the static prefix is large enough to be held as Vertex AI cached content.
+
+Run from the repository root:
+    python -m utils.benchmarks.prompt_render_benchmark [iterations]
+"""
+from config.settings import GEMINI_CONTEXT_CACHE_MIN_TOKENS
+from gemini_processor.prompt_preparer import CHARS_PER_TOKEN
+from gemini_processor.prompt_template import PrefixedPromptTemplate
+from gemini_processor.templates.base_project_template import BASE_PROJECT_PREFIX_TEMPLATE, BASE_PROJECT_SUFFIX_TEMPLATE
+from jinja2 import Template
+from utils.samples.sample_project_template_values import input_readme, example_readme, example_output
+import sys
+import time
+
+# The project prompt as it was before the prompt was split and the few-shot example removed
+BASELINE_PROJECT_TEMPLATE = Template(
+"""
+The following readme is a project's design documentation. Analyze it and extract important project information in the expected json format:
+
+**Project Description:**
+{{ input_readme }}
+
+**Expected Format:**
+{{ expected_response_format }}
+
+**Instructions:**
+1. Based on the project description, determine appropriate values for each field in JSON format.
+2. Associate images where needed and be creative figuring out each section.
+2. Provide the extracted information in the JSON format as shown in the example.
+4. Don't drop any JSON field and make every part unique but technical.
+
+**Example Project Description:**
+{{ example_readme }}
+
+**Expected JSON Format:**
+{{ example_output }}
+
+**Guidelines:**
+* Extract only the most relevant information.
+* Ensure the output is in the correct JSON format.
+* Be concise but don't remove any technical details.
+"""
+)
+BASELINE_EXPECTED_RESPONSE_FORMAT = """{
+    "id": "str",
+    "projectHeroImg": "str",
+    "projectTitle": "str",
+    "readTimeInMins": "int",
+    "overview": {
+        "textContents": [
+            {
+                "content": "str",
+                "imgUrl": "str"
+            }
+        ]
+    },
+    "problemStatement": "str",
+    "features": {
+        "textContents": [
+            {
+                "content": "str",
+                "imgUrl": "str"
+            }
+        ]
+    },
+    "demo": {
+        "title": "str",
+        "imgUrl": "str",
+        "videoUrl": "str",
+        "genres": ["List[str]"]
+    },
+    "relevantLinks": ["List[str]"],
+    "author": "Optional[str]"
+}"""
+
+def time_per_call(render, iterations):
+    """
+    Returns the average duration of a render call, in microseconds.
+    """
+    started_at = time.perf_counter()
+    for _ in range(iterations):
+        render()
+    return (time.perf_counter() - started_at) / iterations * 1e6
+
+def compare(before, after):
+    """
+    Describes how much faster or slower `after` is than `before`.
+    """
+    if after <= before:
+        return f"{before / after:.1f}x faster"
+    return f"{after / before:.1f}x slower"
+
+def main(iterations=10000):
+    baseline_values = {
+        "input_readme": input_readme,
+        "expected_response_format": BASELINE_EXPECTED_RESPONSE_FORMAT,
+        "example_readme": example_readme,
+        "example_output": example_output,
+    }
+    prompt_template = PrefixedPromptTemplate(BASE_PROJECT_PREFIX_TEMPLATE, BASE_PROJECT_SUFFIX_TEMPLATE)
+
+    before = time_per_call(lambda: BASELINE_PROJECT_TEMPLATE.render(baseline_values), iterations)
+    after = time_per_call(lambda: prompt_template.render(input_readme=input_readme), iterations)
+    baseline_prompt = BASELINE_PROJECT_TEMPLATE.render(baseline_values)
+    prompt = prompt_template.render(input_readme=input_readme)
+    prefix_tokens = len(prompt_template.prefix) // CHARS_PER_TOKEN
+
+    print(f"Render time over {iterations} calls:")
+    print(f"  original template:         {before:8.1f} us/call")
+    print(f"  prefix once + suffix:      {after:8.1f} us/call ({compare(before, after)})")
+    print("Request payload per project:")
+    print(f"  original prompt:           {len(baseline_prompt.encode('utf-8')):8d} bytes")
+    print(f"  current prompt:            {len(prompt.encode('utf-8')):8d} bytes")
+    print(f"  static prefix:             {len(prompt_template.prefix.encode('utf-8')):8d} bytes")
+    cacheable = "cached" if prefix_tokens >= GEMINI_CONTEXT_CACHE_MIN_TOKENS else "sent inline, below the context cache minimum"
+    print(f"  static prefix is {cacheable} (~{prefix_tokens} of {GEMINI_CONTEXT_CACHE_MIN_TOKENS} tokens)")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
@@ -0,0 +1,85 @@
+import io
+
+# Leading bytes identifying the image formats found in Drive exports
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+    (b"II*\x00", "image/tiff"),
+    (b"MM\x00*", "image/tiff"),
+    (b"\x00\x00\x01\x00", "image/x-icon"),
+]
+
+IMAGE_EXTENSIONS = {
+    "image/png": "png",
+    "image/jpeg": "jpg",
+    "image/gif": "gif",
+    "image/webp": "webp",
+    "image/bmp": "bmp",
+    "image/tiff": "tiff",
+    "image/x-icon": "ico",
+    "image/svg+xml": "svg",
+}
+
+# Raster formats converted to WebP when transcoding. GIFs are left alone since they may be animated.
+TRANSCODABLE_MIME_TYPES = {"image/png", "image/jpeg", "image/bmp", "image/tiff", "image/webp"}
+
+def detect_image_mime_type(image_data, fallback="application/octet-stream"):
+    """
+    Detects the MIME type of an image from its leading magic bytes.
+
+    Args:
+        image_data (bytes): The raw image data.
+        fallback (str, optional): The MIME type returned when the format is not recognized.
+
+    Returns:
+        str: The detected MIME type, or the fallback.
+    """
+    for signature, mime_type in IMAGE_SIGNATURES:
+        if image_data.startswith(signature):
+            return mime_type
+    if image_data[:4] == b"RIFF" and image_data[8:12] == b"WEBP":
+        return "image/webp"
+    head = image_data[:512].lstrip().lower()
+    if head.startswith(b"<svg") or (head.startswith(b"<?xml") and b"<svg" in head):
+        return "image/svg+xml"
+    return fallback
+
+def image_extension(mime_type):
+    """
+    Returns the file extension used for an image MIME type, defaulting to "bin" for unknown types.
+    """
+    return IMAGE_EXTENSIONS.get(mime_type, "bin")
+
+def transcode_image(image_data, max_width, max_height, quality=80):
+    """
+    Downsizes an image to fit within the given dimensions, keeping its aspect ratio, and
+    re-encodes it as WebP.
+
+    Pillow is only imported when transcoding is actually used.
+
+    Args:
+        image_data (bytes): The raw image data, in one of the `TRANSCODABLE_MIME_TYPES` formats.
+        max_width (int): The maximum width of the output image in pixels.
+        max_height (int): The maximum height of the output image in pixels.
+        quality (int, optional): The WebP quality, from 0 to 100. Defaults to 80.
+
+    Returns:
+        bytes: The WebP encoded image.
+
+    Raises:
+        RuntimeError: If Pillow is not installed.
+    """
+    try:
+        from PIL import Image
+    except ImportError as error:
+        raise RuntimeError("Image transcoding requires Pillow. Install it with `pip install pillow`.") from error
+    with Image.open(io.BytesIO(image_data)) as image:
+        # Keep transparency where the source has it
+        image = image.convert("RGBA" if "A" in image.getbands() or "transparency" in image.info else "RGB")
+        image.thumbnail((max_width, max_height))
+        output = io.BytesIO()
+        image.save(output, format="WEBP", quality=quality, method=4)
+        return output.getvalue()
@@ -0,0 +1,24 @@
+"""
+Creates the page documents of the 'gdg-fisk-content' collection that are missing, with default
+data, instead of checking them every time a FirestoreManager starts.
+
+With --split, also migrates page documents holding full projects, codelabs and testimonials to
+one document per entity with summaries in the page documents.
+
+Run from the repository root:
+    python -m utils.migrations.bootstrap_firestore [--split]
+"""
+from db_manager import FirestoreManager
+import sys
+
+def main(split=False):
+    firestore_manager = FirestoreManager()
+    created = firestore_manager.bootstrap_documents()
+    if created is None:
+        sys.exit("Bootstrap failed, see the logs.")
+    print(f"Created documents: {', '.join(created) or 'none'}")
+    if split and not firestore_manager.split_page_documents():
+        sys.exit("Entity migration failed, see the logs.")
+
+if __name__ == "__main__":
+    main(split="--split" in sys.argv[1:])
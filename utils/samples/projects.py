@@ -1,4 +1,4 @@
-from models import ProjectsPageResponse, Project, Section, TextContent, VideoContent
+from models import ProjectsPageResponse, ProjectSummary, Project, Section, TextContent, VideoContent
 
 sample_projects = [
     Project(
@@ -76,5 +76,13 @@ sample_projects = [
     ),
 ]
 
-# Sample projects object
-sample_project_page_response = ProjectsPageResponse(projects=sample_projects)
\ No newline at end of file
+# Sample projects object: the page only holds the summaries, the full projects are stored as entities
+sample_project_page_response = ProjectsPageResponse(projects=[
+    ProjectSummary(
+        id=project.id,
+        projectHeroImg=project.projectHeroImg,
+        projectTitle=project.projectTitle,
+        overview=project.overview
+    )
+    for project in sample_projects
+])
\ No newline at end of file